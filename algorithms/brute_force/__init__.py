@@ -0,0 +1 @@
+from .brute_force import BruteForceIndex
@@ -0,0 +1,52 @@
+import numpy as np
+
+from algorithms.utils.arrays import as_points_array
+
+_CHUNK = 256
+
+
+class BruteForceIndex:
+    """Bez struktury: jedna wektorowa maska na tablicach współrzędnych.
+
+    Budowa to tylko kopia współrzędnych, zapytanie O(n) w NumPy. Dla małych
+    zbiorów i dużych prostokątów szybsze od każdego drzewa; służy też jako
+    wyrocznia w testach. Brzegi włącznie, jak Rectangle.contains.
+    """
+
+    def __init__(self, points_list):
+        pts = as_points_array(points_list)
+        self.xs = pts[:, 0].copy()
+        self.ys = pts[:, 1].copy()
+
+    def __len__(self):
+        return len(self.xs)
+
+    @property
+    def nbytes(self):
+        return self.xs.nbytes + self.ys.nbytes
+
+    def _mask(self, range_rect):
+        x, y, w, h = range_rect.x, range_rect.y, range_rect.w, range_rect.h
+        xs, ys = self.xs, self.ys
+        return (x - w <= xs) & (xs <= x + w) & (y - h <= ys) & (ys <= y + h)
+
+    def query(self, range_rect, return_indices=False):
+        ids = np.flatnonzero(self._mask(range_rect))
+        if return_indices:
+            return ids
+        return list(zip(self.xs[ids].tolist(), self.ys[ids].tolist()))
+
+    def count(self, range_rect):
+        return int(np.count_nonzero(self._mask(range_rect)))
+
+    def iter_query(self, range_rect, limit=None):
+        """Leniwa wersja query: maska jest liczona raz, krotki powstają paczkami."""
+        return self._iter_points(np.flatnonzero(self._mask(range_rect))[:limit])
+
+    def _iter_points(self, ids):
+        for lo in range(0, len(ids), _CHUNK):
+            chunk = ids[lo:lo + _CHUNK]
+            yield from zip(self.xs[chunk].tolist(), self.ys[chunk].tolist())
+
+    def any_in(self, range_rect):
+        return bool(self._mask(range_rect).any())
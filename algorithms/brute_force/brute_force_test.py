@@ -0,0 +1,34 @@
+from algorithms.quadtree.quadtree import Rectangle, Point
+from algorithms.brute_force.brute_force import BruteForceIndex
+from test_data import TEST_DATA
+
+def run_brute_force_tests():
+    print("rozpoczynam test brute force")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        expected = case["RES"]
+        q_rect = Rectangle(*case["R"])
+
+        index = BruteForceIndex(points)
+        from_objects = BruteForceIndex([Point(x, y) for x, y in points])
+
+        result = sorted(index.query(q_rect))
+        by_index = sorted(points[j] for j in index.query(q_rect, return_indices=True))
+
+        if (result == expected and by_index == expected and sorted(from_objects.query(q_rect)) == expected
+                and index.count(q_rect) == len(expected) and index.any_in(q_rect) == bool(expected)
+                and sorted(index.iter_query(q_rect)) == expected
+                and list(index.iter_query(q_rect, limit=3)) == index.query(q_rect)[:3]):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik Brute Force: {passed}/{total} zaliczonych.\n")
+
+if __name__ == "__main__":
+    run_brute_force_tests()
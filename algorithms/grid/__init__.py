@@ -0,0 +1 @@
+from .grid_index import GridIndex
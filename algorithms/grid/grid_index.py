@@ -0,0 +1,163 @@
+import math
+from itertools import islice
+
+import numpy as np
+
+from algorithms.utils.arrays import as_points_array, ranges_to_indices
+
+
+class GridIndex:
+    """Płaska siatka kubełków: ok. `capacity` punktów na komórkę.
+
+    Punkty są posortowane po numerze komórki (wierszami), a `offsets` to
+    przesunięcia CSR, więc komórki jednego wiersza tworzą ciągły wycinek
+    tablic `xs` / `ys`. Komórki w całości wewnątrz zapytania są zwracane
+    bez sprawdzania punktów.
+    """
+
+    def __init__(self, points_list, capacity=4):
+        self.capacity = capacity
+
+        pts = as_points_array(points_list)
+        n = len(pts)
+        self.n = n
+
+        if n:
+            self.x_min, self.y_min = pts.min(axis=0).tolist()
+            self.x_max, self.y_max = pts.max(axis=0).tolist()
+        else:
+            self.x_min = self.y_min = self.x_max = self.y_max = 0.0
+        span_x = self.x_max - self.x_min
+        span_y = self.y_max - self.y_min
+
+        # Siatka gx * gy ~ n / capacity komórek, proporcjonalna do ramki danych
+        n_cells = max(1, n // max(1, capacity))
+        if span_x > 0 and span_y > 0:
+            gx = max(1, round(math.sqrt(n_cells * span_x / span_y)))
+            gy = max(1, math.ceil(n_cells / gx))
+        elif span_x > 0:
+            gx, gy = n_cells, 1
+        else:
+            gx, gy = 1, n_cells if span_y > 0 else 1
+        self.gx, self.gy = gx, gy
+        self.cell_w = span_x / gx if span_x > 0 else 1.0
+        self.cell_h = span_y / gy if span_y > 0 else 1.0
+
+        cx = self._column(pts[:, 0])
+        cy = self._row(pts[:, 1])
+        cells = cy * gx + cx
+        order = np.argsort(cells, kind="stable")
+        self.index = order.astype(np.intp)
+        self.xs = pts[order, 0]
+        self.ys = pts[order, 1]
+        self.offsets = np.zeros(gx * gy + 1, dtype=np.intp)
+        np.cumsum(np.bincount(cells, minlength=gx * gy), out=self.offsets[1:])
+
+    def _column(self, x):
+        return np.clip(np.floor((x - self.x_min) / self.cell_w), 0, self.gx - 1).astype(np.intp)
+
+    def _row(self, y):
+        return np.clip(np.floor((y - self.y_min) / self.cell_h), 0, self.gy - 1).astype(np.intp)
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.index, self.xs, self.ys, self.offsets))
+
+    def _span(self, lo, hi, cell, g, data_lo, data_hi):
+        """Zakres komórek [c0, c1] przecinanych przez [lo, hi] i podzakres komórek w całości wewnątrz."""
+        c0 = int(min(max(math.floor((lo - data_lo) / cell), 0), g - 1))
+        c1 = int(min(max(math.floor((hi - data_lo) / cell), 0), g - 1))
+        # Komórki ściśle między brzegowymi mają wszystkie punkty w [lo, hi];
+        # brzegowa też, jeśli zapytanie wychodzi poza dane z tej strony
+        f0 = c0 if lo <= data_lo else c0 + 1
+        f1 = c1 if hi >= data_hi else c1 - 1
+        return c0, c1, f0, f1
+
+    def _ranges(self, range_rect):
+        """Zakresy pozycji: całe (bez testów) i brzegowe (do filtrowania)."""
+        qx0, qx1 = range_rect.x - range_rect.w, range_rect.x + range_rect.w
+        qy0, qy1 = range_rect.y - range_rect.h, range_rect.y + range_rect.h
+        empty = np.empty(0, dtype=np.intp)
+        if not self.n or qx1 < self.x_min or qx0 > self.x_max or qy1 < self.y_min or qy0 > self.y_max:
+            return (empty, empty), (empty, empty)
+
+        cx0, cx1, fx0, fx1 = self._span(qx0, qx1, self.cell_w, self.gx, self.x_min, self.x_max)
+        cy0, cy1, fy0, fy1 = self._span(qy0, qy1, self.cell_h, self.gy, self.y_min, self.y_max)
+
+        rows = np.arange(cy0, cy1 + 1)
+        y_full = (rows >= fy0) & (rows <= fy1)
+        base = rows * self.gx
+
+        # Kolumny: pełne [fx0, fx1] i brzegowe; przy jednej-dwóch kolumnach wszystkie brzegowe
+        if fx0 <= fx1:
+            full_cols = [(fx0, fx1 + 1)]
+            edge_cols = [(a, b) for a, b in ((cx0, fx0), (fx1 + 1, cx1 + 1)) if a < b]
+        else:
+            full_cols = []
+            edge_cols = [(cx0, cx1 + 1)]
+
+        off = self.offsets
+        full_starts, full_ends, part_starts, part_ends = [], [], [], []
+        fb = base[y_full]
+        for a, b in full_cols:
+            full_starts.append(off[fb + a])
+            full_ends.append(off[fb + b])
+        for a, b in edge_cols:
+            part_starts.append(off[fb + a])
+            part_ends.append(off[fb + b])
+        pb = base[~y_full]
+        part_starts.append(off[pb + cx0])
+        part_ends.append(off[pb + cx1 + 1])
+
+        full = (np.concatenate(full_starts) if full_starts else empty,
+                np.concatenate(full_ends) if full_ends else empty)
+        return full, (np.concatenate(part_starts), np.concatenate(part_ends))
+
+    def query_positions(self, range_rect):
+        full, partial = self._ranges(range_rect)
+        pos_full = ranges_to_indices(*full)
+        pos_part = ranges_to_indices(*partial)
+
+        x, y, w, h = range_rect.x, range_rect.y, range_rect.w, range_rect.h
+        xs = self.xs[pos_part]
+        ys = self.ys[pos_part]
+        mask = (x - w <= xs) & (xs <= x + w) & (y - h <= ys) & (ys <= y + h)
+        return np.concatenate((pos_full, pos_part[mask]))
+
+    def query(self, range_rect, return_indices=False):
+        pos = self.query_positions(range_rect)
+        if return_indices:
+            return self.index[pos]
+        return list(zip(self.xs[pos].tolist(), self.ys[pos].tolist()))
+
+    def count(self, range_rect):
+        full, partial = self._ranges(range_rect)
+        pos_part = ranges_to_indices(*partial)
+        x, y, w, h = range_rect.x, range_rect.y, range_rect.w, range_rect.h
+        xs = self.xs[pos_part]
+        ys = self.ys[pos_part]
+        mask = (x - w <= xs) & (xs <= x + w) & (y - h <= ys) & (ys <= y + h)
+        return int((full[1] - full[0]).sum()) + int(mask.sum())
+
+    def iter_query(self, range_rect, limit=None):
+        """Leniwa wersja query: wycinki kolejnych wierszy są zwracane po kolei."""
+        return islice(self._iter_search(range_rect), limit)
+
+    def any_in(self, range_rect):
+        for _ in self._iter_search(range_rect):
+            return True
+        return False
+
+    def _iter_search(self, range_rect):
+        full, partial = self._ranges(range_rect)
+        for lo, hi in zip(full[0].tolist(), full[1].tolist()):
+            yield from zip(self.xs[lo:hi].tolist(), self.ys[lo:hi].tolist())
+
+        x, y, w, h = range_rect.x, range_rect.y, range_rect.w, range_rect.h
+        for lo, hi in zip(partial[0].tolist(), partial[1].tolist()):
+            for px, py in zip(self.xs[lo:hi].tolist(), self.ys[lo:hi].tolist()):
+                if x - w <= px <= x + w and y - h <= py <= y + h:
+                    yield (px, py)
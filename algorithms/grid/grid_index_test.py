@@ -0,0 +1,69 @@
+import random
+
+from algorithms.quadtree.quadtree import Rectangle
+from algorithms.grid.grid_index import GridIndex
+from test_data import TEST_DATA
+
+def run_grid_index_tests(capacity=4):
+    print(f"rozpoczynam test grid index (capacity={capacity})")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        expected = case["RES"]
+        q_rect = Rectangle(*case["R"])
+
+        grid = GridIndex(points, capacity=capacity)
+
+        result = sorted(grid.query(q_rect))
+        by_index = sorted(points[j] for j in grid.query(q_rect, return_indices=True))
+        lazy = sorted(grid.iter_query(q_rect))
+
+        if (result == expected and by_index == expected and lazy == expected
+                and grid.count(q_rect) == len(expected) and grid.any_in(q_rect) == bool(expected)):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik Grid Index: {passed}/{total} zaliczonych.\n")
+
+def run_grid_index_edge_tests():
+    print("rozpoczynam test grid index (siatka, prosta, brzegi)")
+    rng = random.Random(0)
+    datasets = [
+        [(float(x), float(y)) for x in range(30) for y in range(30)],
+        [(t, 5.0) for t in range(200)],
+        [(rng.uniform(-100, 100), rng.uniform(-100, 100)) for _ in range(2000)],
+    ]
+    passed = 0
+    total = 0
+
+    for points in datasets:
+        grid = GridIndex(points, capacity=4)
+        # Zapytania o brzegach leżących dokładnie na punktach i wychodzące poza dane
+        for _ in range(20):
+            a, b = rng.sample(points, 2)
+            x0, x1 = sorted((a[0], b[0]))
+            y0, y1 = sorted((a[1], b[1]))
+            if rng.random() < 0.3:
+                x0, y1 = x0 - 1000, y1 + 1000
+            q_rect = Rectangle((x0 + x1) / 2, (y0 + y1) / 2, (x1 - x0) / 2, (y1 - y0) / 2)
+            expected = sorted(p for p in points
+                              if q_rect.x - q_rect.w <= p[0] <= q_rect.x + q_rect.w
+                              and q_rect.y - q_rect.h <= p[1] <= q_rect.y + q_rect.h)
+            total += 1
+            if sorted(grid.query(q_rect)) == expected and grid.count(q_rect) == len(expected):
+                passed += 1
+            else:
+                print(f"Test {total}: BŁĄD!")
+                print(f"   Oczekiwano: {len(expected)}, Otrzymano: {grid.count(q_rect)}")
+
+    print(f"\nWynik brzegów Grid Index: {passed}/{total} zaliczonych.\n")
+
+if __name__ == "__main__":
+    run_grid_index_tests()
+    run_grid_index_tests(capacity=1)
+    run_grid_index_edge_tests()
@@ -0,0 +1,221 @@
+import numpy as np
+
+from algorithms.kd_tree.kd_class import KDTree
+
+
+class _Level:
+    """Statyczne KDTree z punktami oznaczanymi jako martwe.
+
+    `dead` jest indeksowane numerem punktu wejściowego (jak wyniki
+    query(..., return_indices=True)), a drzewo Fenwicka `_dead_bit` zlicza
+    martwe po pozycjach w KDTree.index, więc poddrzewo [lo, lo + size)
+    odejmuje swoich martwych w O(log n).
+    """
+
+    def __init__(self, points, eps, leaf_size):
+        self.points = points
+        self.tree = KDTree(points, eps=eps, leaf_size=leaf_size)
+        self.dead = np.zeros(len(points), dtype=bool)
+        self.n_dead = 0
+        self._dead_bit = None
+        self._slots = None
+
+    def _free_slots(self):
+        # Budowane przy pierwszym usunięciu: punkt -> pozycje żywych kopii w KDTree.index
+        if self._slots is None:
+            self._slots = {}
+            points = self.points
+            for pos, i in enumerate(self.tree.index.tolist()):
+                self._slots.setdefault(points[i], []).append(pos)
+            self._dead_bit = [0] * (len(points) + 1)
+        return self._slots
+
+    def has_live(self, point):
+        return bool(self._free_slots().get(point))
+
+    def kill(self, point):
+        pos = self._free_slots()[point].pop()
+        self.dead[self.tree.index[pos]] = True
+        self.n_dead += 1
+        bit = self._dead_bit
+        pos += 1
+        while pos < len(bit):
+            bit[pos] += 1
+            pos += pos & -pos
+
+    def _dead_before(self, pos):
+        bit = self._dead_bit
+        total = 0
+        while pos > 0:
+            total += bit[pos]
+            pos -= pos & -pos
+        return total
+
+    def live_points(self):
+        if not self.n_dead:
+            return list(self.points)
+        points = self.points
+        return [points[i] for i in np.flatnonzero(~self.dead).tolist()]
+
+    def query(self, region):
+        if not self.n_dead:
+            return self.tree.query(region)
+        ids = self.tree.query(region, return_indices=True)
+        points = self.points
+        return [points[i] for i in ids[~self.dead[ids]].tolist()]
+
+    def count(self, region):
+        tree = self.tree
+        if not self.n_dead:
+            return tree.count(region)
+        if tree.root is None:
+            return 0
+        inf = float("inf")
+        return self._count_rec(tree.root, tuple(region), (-inf, inf, -inf, inf))
+
+    def _count_rec(self, v, query_R, region_v):
+        # KDTree._count_rec z pominięciem martwych punktów
+        tree = self.tree
+        rx_min, rx_max, ry_min, ry_max = query_R
+        EPS = tree.eps
+
+        if v.is_leaf():
+            dead, index = self.dead, tree.index
+            return sum(1 for j, (x, y) in enumerate(v.leaf_points())
+                       if (rx_min - EPS <= x <= rx_max + EPS) and (ry_min - EPS <= y <= ry_max + EPS)
+                       and not dead[index[v.lo + j]])
+
+        min_x, max_x, min_y, max_y = region_v
+        split = v.split_val
+
+        if v.axis == 0:
+            region_lc = (min_x, split, min_y, max_y)
+            region_rc = (split, max_x, min_y, max_y)
+        else:
+            region_lc = (min_x, max_x, min_y, split)
+            region_rc = (min_x, max_x, split, max_y)
+
+        total = 0
+        for child, region_c in ((v.left, region_lc), (v.right, region_rc)):
+            if child is None:
+                continue
+            status = tree._classify_region(region_c, rx_min, rx_max, ry_min, ry_max, EPS)
+            if status == tree._INSIDE:
+                total += child.size - (self._dead_before(child.lo + child.size) - self._dead_before(child.lo))
+            elif status == tree._INTERSECTS:
+                total += self._count_rec(child, query_R, region_c)
+        return total
+
+
+class DynamicKDTree:
+    """KD-Tree z insert/delete metodą logarytmiczną (Bentley-Saxe).
+
+    Punkty trafiają najpierw do bufora; gdy się zapełni, łączony jest z kolejnymi
+    zajętymi poziomami i budowane jest jedno statyczne KDTree na pierwszym wolnym
+    poziomie (poziom i mieści do buffer_size * 2^i punktów). Usunięcie oznacza
+    punkt jako martwy (tombstone); gdy martwych jest więcej niż
+    `rebuild_ratio` * wszystkich, całość jest przebudowywana.
+    """
+
+    def __init__(self, points=(), eps=1e-9, leaf_size=8, buffer_size=64, rebuild_ratio=0.5):
+        self.eps = eps
+        self.leaf_size = leaf_size
+        self.buffer_size = buffer_size
+        self.rebuild_ratio = rebuild_ratio
+        self.buffer = []
+        self.levels = []
+        self.n_dead = 0
+        self.n_stored = 0
+
+        points = [(x, y) for x, y in points]
+        if points:
+            self._rebuild(points)
+
+    def __len__(self):
+        return self.n_stored - self.n_dead
+
+    def insert(self, point):
+        x, y = point
+        self.buffer.append((x, y))
+        self.n_stored += 1
+        if len(self.buffer) >= self.buffer_size:
+            self._flush_buffer()
+
+    def delete(self, point):
+        x, y = point
+        point = (x, y)
+        if point in self.buffer:
+            self.buffer.remove(point)
+            self.n_stored -= 1
+            return True
+
+        for level in self.levels:
+            if level is not None and level.has_live(point):
+                level.kill(point)
+                self.n_dead += 1
+                if self.n_dead > self.rebuild_ratio * self.n_stored:
+                    self._rebuild(self._live_points())
+                return True
+        return False
+
+    def _flush_buffer(self):
+        carry = self.buffer
+        self.buffer = []
+        i = 0
+        while i < len(self.levels) and self.levels[i] is not None:
+            carry.extend(self._take(i))
+            i += 1
+        self._place(carry)
+
+    def _take(self, i):
+        level = self.levels[i]
+        self.levels[i] = None
+        self.n_dead -= level.n_dead
+        self.n_stored -= level.n_dead
+        return level.live_points()
+
+    def _place(self, points):
+        i = 0
+        while self.buffer_size << i < len(points):
+            i += 1
+        while len(self.levels) <= i:
+            self.levels.append(None)
+        if self.levels[i] is not None:
+            self._place(points + self._take(i))
+            return
+        self.levels[i] = _Level(points, self.eps, self.leaf_size)
+
+    def _live_points(self):
+        points = list(self.buffer)
+        for level in self.levels:
+            if level is not None:
+                points.extend(level.live_points())
+        return points
+
+    def _rebuild(self, points):
+        self.buffer = []
+        self.levels = []
+        self.n_dead = 0
+        self.n_stored = len(points)
+        if points:
+            self._place(points)
+
+    def _in_region(self, point, region):
+        x_min, x_max, y_min, y_max = region
+        EPS = self.eps
+        x, y = point
+        return (x_min - EPS <= x <= x_max + EPS) and (y_min - EPS <= y <= y_max + EPS)
+
+    def query(self, region):
+        results = [p for p in self.buffer if self._in_region(p, region)]
+        for level in self.levels:
+            if level is not None:
+                results.extend(level.query(region))
+        return results
+
+    def count(self, region):
+        total = sum(1 for p in self.buffer if self._in_region(p, region))
+        for level in self.levels:
+            if level is not None:
+                total += level.count(region)
+        return total
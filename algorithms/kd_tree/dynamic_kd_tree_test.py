@@ -0,0 +1,46 @@
+import random
+from collections import Counter
+
+from algorithms.kd_tree.dynamic_kd_tree import DynamicKDTree
+from test_data import TEST_DATA
+
+def run_dynamic_kdtree_tests():
+    print("rozpoczynam testy dynamic kdtree")
+    passed = 0
+    total = len(TEST_DATA)
+    rng = random.Random(0)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        cx, cy, w, h = case["R"]
+        region = (cx - w, cx + w, cy - h, cy + h)
+
+        half = len(points) // 2
+        tree = DynamicKDTree(points[:half], buffer_size=4)
+        for p in points[half:]:
+            tree.insert(p)
+            tree.insert(p)
+
+        removed = rng.sample(points, len(points) // 3)
+        for p in removed:
+            tree.delete(p)
+        for p in points[half:]:
+            tree.delete(p)
+
+        live = Counter(points)
+        live.subtract(removed)
+        expected = sorted(p for p in live.elements()
+                          if cx - w <= p[0] <= cx + w and cy - h <= p[1] <= cy + h)
+        result = sorted(tree.query(region))
+
+        if result == expected and tree.count(region) == len(expected) and len(tree) == sum(live.values()):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik Dynamic KD-Tree: {passed}/{total} zaliczonych.\n")
+
+if __name__ == "__main__":
+    run_dynamic_kdtree_tests()
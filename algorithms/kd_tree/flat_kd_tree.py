@@ -0,0 +1,169 @@
+import numpy as np
+
+
+class FlatKDTree:
+    """KD-Tree trzymane w ciągłych tablicach NumPy (układ pre-order).
+
+    Lewe dziecko węzła `v` to zawsze `v + 1`, prawe jest zapisane w `right[v]`.
+    Punkty są permutowane w kolejności liści, więc poddrzewo węzła `v`
+    to wycinek `[lo[v], hi[v])` tablic `xs` / `ys`.
+    """
+
+    _LEAF = -1
+
+    _OUTSIDE = 0
+    _INSIDE = 1
+    _INTERSECTS = 2
+
+    def __init__(self, points, eps=1e-9, leaf_size=1):
+        self.eps = eps
+        self.leaf_size = max(1, int(leaf_size))
+
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        n = len(pts)
+        self.n = n
+
+        idx_dtype = np.int32 if 2 * n < np.iinfo(np.int32).max else np.int64
+        max_nodes = max(2 * n - 1, 0)
+        self.axis = np.full(max_nodes, self._LEAF, dtype=np.int8)
+        self.split = np.zeros(max_nodes, dtype=np.float64)
+        self.right = np.full(max_nodes, -1, dtype=idx_dtype)
+        self.lo = np.zeros(max_nodes, dtype=idx_dtype)
+        self.hi = np.zeros(max_nodes, dtype=idx_dtype)
+        self.index = np.arange(n, dtype=idx_dtype)
+        self.xs = pts[:, 0].copy()
+        self.ys = pts[:, 1].copy()
+
+        if n == 0:
+            return
+
+        n_nodes = self._build(pts[:, 0], pts[:, 1])
+
+        self.axis = self.axis[:n_nodes].copy()
+        self.split = self.split[:n_nodes].copy()
+        self.right = self.right[:n_nodes].copy()
+        self.lo = self.lo[:n_nodes].copy()
+        self.hi = self.hi[:n_nodes].copy()
+        self.xs = pts[self.index, 0]
+        self.ys = pts[self.index, 1]
+
+    def _build(self, xs, ys):
+        perm = self.index
+        leaf_size = self.leaf_size
+        n_nodes = 0
+
+        # (lo, hi, depth, rodzic oczekujący na indeks prawego dziecka)
+        stack = [(0, self.n, 0, -1)]
+        while stack:
+            lo, hi, depth, parent = stack.pop()
+            node = n_nodes
+            n_nodes += 1
+            if parent >= 0:
+                self.right[parent] = node
+            self.lo[node] = lo
+            self.hi[node] = hi
+
+            if hi - lo <= leaf_size:
+                continue
+
+            axis = depth % 2
+            seg = perm[lo:hi]
+            # Ten sam porządek co w KDTree: (x, y, i) lub (y, x, i)
+            if axis == 0:
+                order = np.lexsort((seg, ys[seg], xs[seg]))
+            else:
+                order = np.lexsort((seg, xs[seg], ys[seg]))
+            seg = seg[order]
+            perm[lo:hi] = seg
+
+            mid = (hi - lo - 1) // 2
+            coords = xs if axis == 0 else ys
+            self.split[node] = coords[seg[mid]]
+            self.axis[node] = axis
+
+            stack.append((lo + mid + 1, hi, depth + 1, node))
+            stack.append((lo, lo + mid + 1, depth + 1, -1))
+
+        return n_nodes
+
+    @property
+    def nbytes(self):
+        arrays = (self.axis, self.split, self.right, self.lo, self.hi,
+                  self.index, self.xs, self.ys)
+        return sum(a.nbytes for a in arrays)
+
+    def _report_range(self, lo, hi, results, return_indices=False):
+        if return_indices:
+            results.append(self.index[lo:hi])
+        else:
+            results.extend(zip(self.xs[lo:hi].tolist(), self.ys[lo:hi].tolist()))
+
+    def _classify_region(self, region, rx_min, rx_max, ry_min, ry_max, EPS):
+        r_xmin, r_xmax, r_ymin, r_ymax = region
+
+        if (r_xmin >= rx_min - EPS and r_xmax <= rx_max + EPS and
+            r_ymin >= ry_min - EPS and r_ymax <= ry_max + EPS):
+            return self._INSIDE
+
+        if (r_xmax < rx_min - EPS or r_xmin > rx_max + EPS or
+            r_ymax < ry_min - EPS or r_ymin > ry_max + EPS):
+            return self._OUTSIDE
+        return self._INTERSECTS
+
+    def _scan_leaf(self, node, rx_min, rx_max, ry_min, ry_max, EPS, results, return_indices=False):
+        lo, hi = int(self.lo[node]), int(self.hi[node])
+        xs = self.xs[lo:hi]
+        ys = self.ys[lo:hi]
+        mask = ((xs >= rx_min - EPS) & (xs <= rx_max + EPS) &
+                (ys >= ry_min - EPS) & (ys <= ry_max + EPS))
+        if return_indices:
+            results.append(self.index[lo:hi][mask])
+        else:
+            results.extend(zip(xs[mask].tolist(), ys[mask].tolist()))
+
+    def query(self, region, return_indices=False):
+        results = self._query(region, return_indices)
+        if return_indices:
+            return np.concatenate(results) if results else np.empty(0, dtype=self.index.dtype)
+        return results
+
+    def _query(self, region, return_indices):
+        results = []
+        if self.n == 0:
+            return results
+
+        rx_min, rx_max, ry_min, ry_max = region
+        EPS = self.eps
+        axis, split, right = self.axis, self.split, self.right
+        lo, hi = self.lo, self.hi
+
+        inf = float("inf")
+        stack = [(0, (-inf, inf, -inf, inf))]
+        while stack:
+            node, (min_x, max_x, min_y, max_y) = stack.pop()
+
+            if axis[node] == self._LEAF:
+                self._scan_leaf(node, rx_min, rx_max, ry_min, ry_max, EPS, results, return_indices)
+                continue
+
+            s = float(split[node])
+            if axis[node] == 0:
+                region_lc = (min_x, s, min_y, max_y)
+                region_rc = (s, max_x, min_y, max_y)
+            else:
+                region_lc = (min_x, max_x, min_y, s)
+                region_rc = (min_x, max_x, s, max_y)
+
+            left_child = node + 1
+            right_child = int(right[node])
+
+            pending = []
+            for child, region_c in ((left_child, region_lc), (right_child, region_rc)):
+                status = self._classify_region(region_c, rx_min, rx_max, ry_min, ry_max, EPS)
+                if status == self._INSIDE:
+                    self._report_range(int(lo[child]), int(hi[child]), results, return_indices)
+                elif status == self._INTERSECTS:
+                    pending.append((child, region_c))
+            stack.extend(reversed(pending))
+
+        return results
@@ -0,0 +1,32 @@
+from algorithms.kd_tree.flat_kd_tree import FlatKDTree
+from test_data import TEST_DATA
+
+def run_flat_kdtree_tests(leaf_size=1):
+    print(f"rozpoczynam testy flat kdtree (leaf_size={leaf_size})")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        rect = case["R"]
+        expected = case["RES"]
+
+        cx, cy, w, h = rect
+        region = (cx - w, cx + w, cy - h, cy + h)
+
+        tree = FlatKDTree(points, leaf_size=leaf_size)
+        result = sorted(tree.query(region))
+        by_index = sorted(points[j] for j in tree.query(region, return_indices=True))
+
+        if result == expected and by_index == expected:
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik Flat KD-Tree: {passed}/{total} zaliczonych.\n")
+
+if __name__ == "__main__":
+    run_flat_kdtree_tests(leaf_size=1)
+    run_flat_kdtree_tests(leaf_size=8)
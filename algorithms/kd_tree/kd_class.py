@@ -1,34 +1,63 @@
+import heapq
+from itertools import islice
+import numpy as np
+
 class Node:
-    def __init__(self, point=None, left=None, right=None, split_val=None, axis=None):
+    def __init__(self, point=None, left=None, right=None, split_val=None, axis=None, bucket=None, lo=0):
         self.point = point
         self.left = left
         self.right = right
         self.split_val = split_val
         self.axis = axis
+        self.bucket = bucket
+        self.bucket_xy = None
+        if bucket is not None:
+            self.bucket_xy = np.asarray(bucket, dtype=np.float64).reshape(-1, 2)
+            self.size = len(bucket)
+        elif point is not None:
+            self.size = 1
+        else:
+            self.size = (left.size if left else 0) + (right.size if right else 0)
+            lo = left.lo if left else (right.lo if right else lo)
+        # Poddrzewo zajmuje wycinek [lo, lo + size) tablicy KDTree.index
+        self.lo = lo
 
     def is_leaf(self):
-        return self.point is not None
+        return self.point is not None or self.bucket is not None
+
+    def leaf_points(self):
+        if self.bucket is not None:
+            return self.bucket
+        return [self.point]
 
 class KDTree:
-    def __init__(self, points, eps=1e-9):
+    def __init__(self, points, eps=1e-9, build="partition", leaf_size=1):
         self.eps = eps
+        self.leaf_size = max(1, int(leaf_size))
         self.root = None
-        if not points:
+        self.index = np.empty(0, dtype=np.intp)
+        if len(points) == 0:
             return
-        pts = [(x, y, i) for i, (x, y) in enumerate(points)]
 
-        P_x = sorted(pts, key=lambda p: (p[0], p[1], p[2]))
-        P_y = sorted(pts, key=lambda p: (p[1], p[0], p[2]))
+        self._leaf_ids = []
+        if build == "partition":
+            self.root = self._build_partition(points)
+        else:
+            pts = [(x, y, i) for i, (x, y) in enumerate(points)]
+
+            P_x = sorted(pts, key=lambda p: (p[0], p[1], p[2]))
+            P_y = sorted(pts, key=lambda p: (p[1], p[0], p[2]))
 
-        self.root = self._build_rec(P_x, P_y, depth=0)
+            self.root = self._build_rec(P_x, P_y, depth=0)
+        self.index = np.array(self._leaf_ids, dtype=np.intp)
+        del self._leaf_ids
 
     def _build_rec(self, P_x, P_y, depth):
         n = len(P_x)
         if n == 0:
             return None
-        if n == 1:
-            x, y, _ = P_x[0]
-            return Node(point=(x, y))  
+        if n <= self.leaf_size:
+            return self._make_leaf([(x, y) for x, y, _ in P_x], [i for _, _, i in P_x])
         axis = depth % 2
         mid = (n - 1) // 2
         if axis == 0:
@@ -50,23 +79,183 @@ class KDTree:
         right = self._build_rec(P2_x, P2_y, depth + 1)
         return Node(left=left, right=right, split_val=split_val, axis=axis)  
 
-    def query(self, region):
+    _PARTITION_CUTOFF = 256
+
+    def _build_partition(self, points):
+        coords = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        n = len(coords)
+        ids = np.arange(n)
+
+        # Unikalne rangi w porządku (x, y, i) i (y, x, i) - te same co P_x / P_y
+        ranks = np.empty((2, n), dtype=np.int64)
+        ranks[0, np.lexsort((ids, coords[:, 1], coords[:, 0]))] = ids
+        ranks[1, np.lexsort((ids, coords[:, 0], coords[:, 1]))] = ids
+
+        self._points = points
+        self._ranks = ranks
+        self._rank_keys = (ranks[0].tolist().__getitem__, ranks[1].tolist().__getitem__)
+        root = self._build_partition_rec(ids.copy(), 0, n, depth=0)
+        del self._points, self._ranks, self._rank_keys
+        return root
+
+    def _build_partition_rec(self, perm, lo, hi, depth):
+        n = hi - lo
+        if n <= self._PARTITION_CUTOFF:
+            seg = perm[lo:hi].tolist()
+            return self._build_small_rec(seg, 0, n, depth)
+
+        axis = depth % 2
+        mid = (n - 1) // 2
+
+        seg = perm[lo:hi]
+        r = self._ranks[axis, seg]
+        k = np.argpartition(r, mid)[mid]
+        split_val = self._points[seg[k]][axis]
+
+        mask = r <= r[k]
+        perm[lo:hi] = np.concatenate((seg[mask], seg[~mask]))
+
+        left = self._build_partition_rec(perm, lo, lo + mid + 1, depth + 1)
+        right = self._build_partition_rec(perm, lo + mid + 1, hi, depth + 1)
+        return Node(left=left, right=right, split_val=split_val, axis=axis)
+
+    def _build_small_rec(self, perm, lo, hi, depth):
+        n = hi - lo
+        if n <= self.leaf_size:
+            leaf = sorted(perm[lo:hi], key=self._rank_keys[0])
+            return self._make_leaf([(x, y) for x, y in map(self._points.__getitem__, leaf)], leaf)
+        axis = depth % 2
+        mid = (n - 1) // 2
+
+        perm[lo:hi] = sorted(perm[lo:hi], key=self._rank_keys[axis])
+        split_val = self._points[perm[lo + mid]][axis]
+
+        left = self._build_small_rec(perm, lo, lo + mid + 1, depth + 1)
+        right = self._build_small_rec(perm, lo + mid + 1, hi, depth + 1)
+        return Node(left=left, right=right, split_val=split_val, axis=axis)
+
+    def _make_leaf(self, points, ids):
+        lo = len(self._leaf_ids)
+        self._leaf_ids.extend(ids)
+        if len(points) == 1:
+            return Node(point=points[0], lo=lo)
+        return Node(bucket=points, lo=lo)
+
+    def query(self, region, return_indices=False):
         if self.root is None:
-            return []
+            return np.empty(0, dtype=np.intp) if return_indices else []
 
         x_min, x_max, y_min, y_max = region
-        results = []
-
         inf = float("inf")
         root_region = (-inf, inf, -inf, inf)
+
+        if return_indices:
+            chunks, positions = [], []
+            self._search_index_rec(self.root, (x_min, x_max, y_min, y_max), root_region, chunks, positions)
+            chunks.append(self.index[positions])
+            return np.concatenate(chunks)
+
+        results = []
         self._search_rec(self.root, (x_min, x_max, y_min, y_max), root_region, results)
         return results
 
+    def iter_query(self, region, limit=None):
+        """Leniwa wersja query: punkty są zwracane w miarę przechodzenia drzewa."""
+        return islice(self._iter_search(region), limit)
+
+    def any_in(self, region):
+        for _ in self._iter_search(region):
+            return True
+        return False
+
+    def _iter_subtree(self, node):
+        stack = [node]
+        while stack:
+            v = stack.pop()
+            if v is None:
+                continue
+            if v.is_leaf():
+                yield from v.leaf_points()
+                continue
+            stack.append(v.right)
+            stack.append(v.left)
+
+    def _iter_search(self, region):
+        if self.root is None:
+            return
+
+        rx_min, rx_max, ry_min, ry_max = region
+        EPS = self.eps
+
+        inf = float("inf")
+        stack = [(self.root, (-inf, inf, -inf, inf))]
+        while stack:
+            v, (min_x, max_x, min_y, max_y) = stack.pop()
+
+            if v.is_leaf():
+                for x, y in v.leaf_points():
+                    if (rx_min - EPS <= x <= rx_max + EPS) and (ry_min - EPS <= y <= ry_max + EPS):
+                        yield (x, y)
+                continue
+
+            split = v.split_val
+            if v.axis == 0:
+                region_lc = (min_x, split, min_y, max_y)
+                region_rc = (split, max_x, min_y, max_y)
+            else:
+                region_lc = (min_x, max_x, min_y, split)
+                region_rc = (min_x, max_x, split, max_y)
+
+            pending = []
+            for child, region_c in ((v.left, region_lc), (v.right, region_rc)):
+                if child is None:
+                    continue
+                status = self._classify_region(region_c, rx_min, rx_max, ry_min, ry_max, EPS)
+                if status == self._INSIDE:
+                    yield from self._iter_subtree(child)
+                elif status == self._INTERSECTS:
+                    pending.append((child, region_c))
+            stack.extend(reversed(pending))
+
+    def _search_index_rec(self, v, query_R, region_v, chunks, positions):
+        # Całe poddrzewa trafiają do `chunks` jako widoki na self.index,
+        # pojedyncze trafienia w liściach jako pozycje w self.index.
+        rx_min, rx_max, ry_min, ry_max = query_R
+        EPS = self.eps
+
+        if v.is_leaf():
+            for j, (x, y) in enumerate(v.leaf_points()):
+                if (rx_min - EPS <= x <= rx_max + EPS) and (ry_min - EPS <= y <= ry_max + EPS):
+                    positions.append(v.lo + j)
+            return
+
+        min_x, max_x, min_y, max_y = region_v
+        split = v.split_val
+
+        if v.axis == 0:
+            region_lc = (min_x, split, min_y, max_y)
+            region_rc = (split, max_x, min_y, max_y)
+        else:
+            region_lc = (min_x, max_x, min_y, split)
+            region_rc = (min_x, max_x, split, max_y)
+
+        for child, region_c in ((v.left, region_lc), (v.right, region_rc)):
+            if child is None:
+                continue
+            status = self._classify_region(region_c, rx_min, rx_max, ry_min, ry_max, EPS)
+            if status == self._INSIDE:
+                chunks.append(self.index[child.lo:child.lo + child.size])
+            elif status == self._INTERSECTS:
+                self._search_index_rec(child, query_R, region_c, chunks, positions)
+
     def _report_subtree(self, node, results):
         if node is None:
             return
         if node.is_leaf():
-            results.append(node.point)
+            if node.bucket is not None:
+                results.extend(node.bucket)
+            else:
+                results.append(node.point)
             return
         self._report_subtree(node.left, results)
         self._report_subtree(node.right, results)
@@ -87,6 +276,246 @@ class KDTree:
             return self._OUTSIDE
         return self._INTERSECTS
 
+    def count(self, region):
+        if self.root is None:
+            return 0
+
+        inf = float("inf")
+        root_region = (-inf, inf, -inf, inf)
+        return self._count_rec(self.root, tuple(region), root_region)
+
+    def _count_rec(self, v, query_R, region_v):
+        if v is None:
+            return 0
+
+        rx_min, rx_max, ry_min, ry_max = query_R
+        EPS = self.eps
+
+        if v.is_leaf():
+            return sum(1 for x, y in v.leaf_points()
+                       if (rx_min - EPS <= x <= rx_max + EPS) and (ry_min - EPS <= y <= ry_max + EPS))
+
+        min_x, max_x, min_y, max_y = region_v
+        split = v.split_val
+
+        if v.axis == 0:
+            region_lc = (min_x, split, min_y, max_y)
+            region_rc = (split, max_x, min_y, max_y)
+        else:
+            region_lc = (min_x, max_x, min_y, split)
+            region_rc = (min_x, max_x, split, max_y)
+
+        total = 0
+        for child, region_c in ((v.left, region_lc), (v.right, region_rc)):
+            status = self._classify_region(region_c, rx_min, rx_max, ry_min, ry_max, EPS)
+            if status == self._INSIDE:
+                total += child.size if child else 0
+            elif status == self._INTERSECTS:
+                total += self._count_rec(child, query_R, region_c)
+        return total
+
+    def query_many(self, regions):
+        """Zapytania dla macierzy (m, 4) prostokątów w jednym przejściu drzewa.
+
+        Zwraca (offsets, indices) w formacie CSR: indeksy punktów wejściowych
+        trafionych przez prostokąt j to indices[offsets[j]:offsets[j + 1]].
+        """
+        regions = np.asarray(regions, dtype=np.float64).reshape(-1, 4)
+        m = len(regions)
+        offsets = np.zeros(m + 1, dtype=np.intp)
+        if self.root is None or m == 0:
+            return offsets, np.empty(0, dtype=np.intp)
+
+        EPS = self.eps
+        bounds = regions + np.array([-EPS, EPS, -EPS, EPS])
+        q_parts, idx_parts = [], []
+
+        inf = float("inf")
+        root_region = (-inf, inf, -inf, inf)
+        self._search_many_rec(self.root, np.arange(m), bounds, root_region, q_parts, idx_parts)
+
+        if not q_parts:
+            return offsets, np.empty(0, dtype=np.intp)
+        qs = np.concatenate(q_parts)
+        indices = np.concatenate(idx_parts)
+        order = np.argsort(qs, kind="stable")
+        np.cumsum(np.bincount(qs, minlength=m), out=offsets[1:])
+        return offsets, indices[order]
+
+    def _classify_many(self, region, bounds):
+        r_xmin, r_xmax, r_ymin, r_ymax = region
+        inside = ((r_xmin >= bounds[:, 0]) & (r_xmax <= bounds[:, 1]) &
+                  (r_ymin >= bounds[:, 2]) & (r_ymax <= bounds[:, 3]))
+        outside = ((r_xmax < bounds[:, 0]) | (r_xmin > bounds[:, 1]) |
+                   (r_ymax < bounds[:, 2]) | (r_ymin > bounds[:, 3]))
+        return inside, ~inside & ~outside
+
+    def _search_many_rec(self, v, active, bounds, region_v, q_parts, idx_parts):
+        if v is None:
+            return
+
+        if v.is_leaf():
+            xy = v.bucket_xy if v.bucket is not None else np.array([v.point], dtype=np.float64)
+            xs = xy[:, 0]
+            ys = xy[:, 1]
+            hits = ((xs >= bounds[:, 0:1]) & (xs <= bounds[:, 1:2]) &
+                    (ys >= bounds[:, 2:3]) & (ys <= bounds[:, 3:4]))
+            qi, pj = np.nonzero(hits)
+            q_parts.append(active[qi])
+            idx_parts.append(self.index[v.lo + pj])
+            return
+
+        min_x, max_x, min_y, max_y = region_v
+        split = v.split_val
+
+        if v.axis == 0:
+            region_lc = (min_x, split, min_y, max_y)
+            region_rc = (split, max_x, min_y, max_y)
+        else:
+            region_lc = (min_x, max_x, min_y, split)
+            region_rc = (min_x, max_x, split, max_y)
+
+        for child, region_c in ((v.left, region_lc), (v.right, region_rc)):
+            if child is None:
+                continue
+            inside, intersects = self._classify_many(region_c, bounds)
+            if inside.any():
+                ids = self.index[child.lo:child.lo + child.size]
+                qs = active[inside]
+                q_parts.append(np.repeat(qs, len(ids)))
+                idx_parts.append(np.tile(ids, len(qs)))
+            if intersects.any():
+                self._search_many_rec(child, active[intersects], bounds[intersects],
+                                      region_c, q_parts, idx_parts)
+
+    def nearest(self, point, k=1):
+        """k najbliższych punktów do `point`, posortowane rosnąco po odległości."""
+        heap = self._nearest_heap(point, k)
+        return [p for _, _, p in sorted(heap, key=lambda e: (-e[0], e[1]))]
+
+    def nearest_many(self, points, k=1):
+        """kNN dla macierzy (m, 2) punktów.
+
+        Zwraca (distances, indices) o kształcie (m, k); brakujące miejsca
+        (gdy drzewo ma mniej niż k punktów) mają odległość inf i indeks -1.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        m = len(points)
+        distances = np.full((m, k), np.inf)
+        indices = np.full((m, k), -1, dtype=np.intp)
+        for q, (x, y) in enumerate(points.tolist()):
+            heap = sorted(self._nearest_heap((x, y), k), key=lambda e: (-e[0], e[1]))
+            for j, (neg_d2, pos, _) in enumerate(heap):
+                distances[q, j] = (-neg_d2) ** 0.5
+                indices[q, j] = self.index[pos]
+        return distances, indices
+
+    def _nearest_heap(self, point, k):
+        heap = []
+        if self.root is None or k <= 0:
+            return heap
+        qx, qy = point
+        self._nearest_rec(self.root, qx, qy, k, heap, 0.0, 0.0, 0.0)
+        return heap
+
+    def _nearest_rec(self, v, qx, qy, k, heap, rd, off_x, off_y):
+        # rd = kwadrat odległości od zapytania do komórki v, złożony z
+        # odległości do płaszczyzn podziału (off_x, off_y) na ścieżce od korzenia
+        if v is None:
+            return
+
+        if v.is_leaf():
+            # Kopiec max po odległości: (-d^2, pozycja w index, punkt)
+            for j, (x, y) in enumerate(v.leaf_points()):
+                d2 = (x - qx) ** 2 + (y - qy) ** 2
+                if len(heap) < k:
+                    heapq.heappush(heap, (-d2, v.lo + j, (x, y)))
+                elif d2 < -heap[0][0]:
+                    heapq.heapreplace(heap, (-d2, v.lo + j, (x, y)))
+            return
+
+        diff = (qx if v.axis == 0 else qy) - v.split_val
+        if diff <= 0:
+            near, far = v.left, v.right
+        else:
+            near, far = v.right, v.left
+
+        self._nearest_rec(near, qx, qy, k, heap, rd, off_x, off_y)
+        if v.axis == 0:
+            far_rd = rd - off_x * off_x + diff * diff
+            far_off = (diff, off_y)
+        else:
+            far_rd = rd - off_y * off_y + diff * diff
+            far_off = (off_x, diff)
+        if len(heap) < k or far_rd < -heap[0][0]:
+            self._nearest_rec(far, qx, qy, k, heap, far_rd, *far_off)
+
+    def query_radius(self, center, r):
+        if self.root is None:
+            return []
+
+        results = []
+        inf = float("inf")
+        root_region = (-inf, inf, -inf, inf)
+        self._search_radius_rec(self.root, tuple(center), r + self.eps, root_region, results)
+        return results
+
+    def _classify_disk(self, region, cx, cy, r):
+        r_xmin, r_xmax, r_ymin, r_ymax = region
+
+        r2 = r * r
+
+        dx = r_xmin - cx if cx < r_xmin else (cx - r_xmax if cx > r_xmax else 0.0)
+        dy = r_ymin - cy if cy < r_ymin else (cy - r_ymax if cy > r_ymax else 0.0)
+        if dx * dx + dy * dy > r2:
+            return self._OUTSIDE
+
+        far_x = cx - r_xmin if cx - r_xmin > r_xmax - cx else r_xmax - cx
+        far_y = cy - r_ymin if cy - r_ymin > r_ymax - cy else r_ymax - cy
+        if far_x * far_x + far_y * far_y <= r2:
+            return self._INSIDE
+        return self._INTERSECTS
+
+    def _search_radius_rec(self, v, center, r, region_v, results):
+        if v is None:
+            return
+
+        cx, cy = center
+
+        if v.is_leaf():
+            r2 = r * r
+            for x, y in v.leaf_points():
+                if (x - cx) ** 2 + (y - cy) ** 2 <= r2:
+                    results.append((x, y))
+            return
+
+        min_x, max_x, min_y, max_y = region_v
+        split = v.split_val
+
+        if v.axis == 0:
+            region_lc = (min_x, split, min_y, max_y)
+            region_rc = (split, max_x, min_y, max_y)
+        else:
+            region_lc = (min_x, max_x, min_y, split)
+            region_rc = (min_x, max_x, split, max_y)
+
+        for child, region_c in ((v.left, region_lc), (v.right, region_rc)):
+            status = self._classify_disk(region_c, cx, cy, r)
+            if status == self._INSIDE:
+                self._report_subtree(child, results)
+            elif status == self._INTERSECTS:
+                self._search_radius_rec(child, center, r, region_c, results)
+
+    def _scan_bucket(self, v, query_R, results):
+        rx_min, rx_max, ry_min, ry_max = query_R
+        EPS = self.eps
+        xs = v.bucket_xy[:, 0]
+        ys = v.bucket_xy[:, 1]
+        mask = ((xs >= rx_min - EPS) & (xs <= rx_max + EPS) &
+                (ys >= ry_min - EPS) & (ys <= ry_max + EPS))
+        bucket = v.bucket
+        results.extend(bucket[i] for i in np.flatnonzero(mask).tolist())
+
     def _search_rec(self, v, query_R, region_v, results):
         if v is None:
             return
@@ -94,6 +523,10 @@ class KDTree:
         rx_min, rx_max, ry_min, ry_max = query_R
         EPS = self.eps
 
+        if v.bucket is not None:
+            self._scan_bucket(v, query_R, results)
+            return
+
         if v.is_leaf():
             x, y = v.point
             if (rx_min - EPS <= x <= rx_max + EPS) and (ry_min - EPS <= y <= ry_max + EPS):
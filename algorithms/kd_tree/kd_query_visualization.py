@@ -62,7 +62,7 @@ def visualize_kdtree_animation(tree, points_list, query_rect):
     def report_subtree_vis(node):
         if node is None: return
         if node.is_leaf():
-            vis.add_point([node.point], color='green', s=30)
+            vis.add_point(node.leaf_points(), color='green', s=30)
             return
         report_subtree_vis(node.left)
         report_subtree_vis(node.right)
@@ -76,9 +76,9 @@ def visualize_kdtree_animation(tree, points_list, query_rect):
         EPS = tree.eps
 
         if node.is_leaf():
-            x, y = node.point
-            if (rx_min - EPS <= x <= rx_max + EPS) and (ry_min - EPS <= y <= ry_max + EPS):
-                vis.add_point([node.point], color='green', s=30)
+            for x, y in node.leaf_points():
+                if (rx_min - EPS <= x <= rx_max + EPS) and (ry_min - EPS <= y <= ry_max + EPS):
+                    vis.add_point([(x, y)], color='green', s=30)
             vis.remove_figure(gray_poly)
             return
 
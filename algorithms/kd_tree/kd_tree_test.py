@@ -1,8 +1,8 @@
 from algorithms.kd_tree.kd_class import KDTree
 from test_data import TEST_DATA
 
-def run_kdtree_tests():
-    print("rozpoczynam testy kdtree")
+def run_kdtree_tests(leaf_size=1):
+    print(f"rozpoczynam testy kdtree (leaf_size={leaf_size})")
     passed = 0
     total = len(TEST_DATA)
 
@@ -14,7 +14,7 @@ def run_kdtree_tests():
         cx, cy, w, h = rect
         region = (cx - w, cx + w, cy - h, cy + h)
 
-        tree = KDTree(points)
+        tree = KDTree(points, leaf_size=leaf_size)
         result_raw = tree.query(region)
         
         result = sorted(result_raw)
@@ -28,5 +28,196 @@ def run_kdtree_tests():
 
     print(f"\nWynik KD-Tree: {passed}/{total} zaliczonych.\n")
 
+def _preorder(node, out):
+    if node.is_leaf():
+        out.append(tuple(node.leaf_points()))
+        return out
+    out.append((node.axis, node.split_val))
+    _preorder(node.left, out)
+    _preorder(node.right, out)
+    return out
+
+def run_kdtree_build_tests(leaf_size=1):
+    print(f"rozpoczynam testy budowy kdtree (sort vs partition, leaf_size={leaf_size})")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"] + case["P"][:5]
+
+        tree_sort = KDTree(points, build="sort", leaf_size=leaf_size)
+        tree_part = KDTree(points, build="partition", leaf_size=leaf_size)
+
+        if _preorder(tree_sort.root, []) == _preorder(tree_part.root, []):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+
+    print(f"\nWynik budowy KD-Tree: {passed}/{total} zaliczonych.\n")
+
+def run_kdtree_count_tests(leaf_size=1):
+    print(f"rozpoczynam testy count kdtree (leaf_size={leaf_size})")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        cx, cy, w, h = case["R"]
+        region = (cx - w, cx + w, cy - h, cy + h)
+
+        tree = KDTree(case["P"], leaf_size=leaf_size)
+        result = tree.count(region)
+
+        if result == len(case["RES"]) and tree.count((-1e9, 1e9, -1e9, 1e9)) == len(case["P"]):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(case['RES'])}, Otrzymano: {result}")
+
+    print(f"\nWynik count KD-Tree: {passed}/{total} zaliczonych.\n")
+
+def run_kdtree_query_many_tests(leaf_size=1):
+    print(f"rozpoczynam testy query_many kdtree (leaf_size={leaf_size})")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        cx, cy, w, h = case["R"]
+        regions = [
+            (cx - w, cx + w, cy - h, cy + h),
+            (-1e9, 1e9, -1e9, 1e9),
+            (2000, 3000, 2000, 3000),
+        ]
+
+        tree = KDTree(points, leaf_size=leaf_size)
+        offsets, indices = tree.query_many(regions)
+        result = [sorted(points[j] for j in indices[offsets[q]:offsets[q + 1]])
+                  for q in range(len(regions))]
+
+        if result == [case["RES"], sorted(points), []]:
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(case['RES'])}, Otrzymano: {len(result[0])}")
+
+    print(f"\nWynik query_many KD-Tree: {passed}/{total} zaliczonych.\n")
+
+def run_kdtree_nearest_tests(k=5, leaf_size=1):
+    print(f"rozpoczynam testy nearest kdtree (k={k}, leaf_size={leaf_size})")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        cx, cy = case["R"][0], case["R"][1]
+
+        def dist(p):
+            return ((p[0] - cx) ** 2 + (p[1] - cy) ** 2) ** 0.5
+
+        expected = sorted(dist(p) for p in points)[:k]
+
+        tree = KDTree(points, leaf_size=leaf_size)
+        result = [dist(p) for p in tree.nearest((cx, cy), k)]
+        distances, indices = tree.nearest_many([(cx, cy)], k)
+        from_many = [dist(points[j]) for j in indices[0]]
+
+        if result == expected and from_many == expected and list(distances[0]) == expected:
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {expected}, Otrzymano: {result}")
+
+    print(f"\nWynik nearest KD-Tree: {passed}/{total} zaliczonych.\n")
+
+def run_kdtree_radius_tests(leaf_size=1):
+    print(f"rozpoczynam testy query_radius kdtree (leaf_size={leaf_size})")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        cx, cy, w, h = case["R"]
+        r = min(w, h)
+        expected = sorted(p for p in points if (p[0] - cx) ** 2 + (p[1] - cy) ** 2 <= r * r)
+
+        tree = KDTree(points, leaf_size=leaf_size)
+        result = sorted(tree.query_radius((cx, cy), r))
+
+        if result == expected:
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik query_radius KD-Tree: {passed}/{total} zaliczonych.\n")
+
+def run_kdtree_index_tests(leaf_size=1):
+    print(f"rozpoczynam testy indeksów kdtree (leaf_size={leaf_size})")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        cx, cy, w, h = case["R"]
+        region = (cx - w, cx + w, cy - h, cy + h)
+
+        tree = KDTree(points, leaf_size=leaf_size)
+        indices = tree.query(region, return_indices=True)
+        result = sorted(points[j] for j in indices)
+
+        if result == case["RES"] and len(set(indices.tolist())) == len(indices):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(case['RES'])}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik indeksów KD-Tree: {passed}/{total} zaliczonych.\n")
+
+def run_kdtree_iter_tests(leaf_size=1):
+    print(f"rozpoczynam testy iter_query kdtree (leaf_size={leaf_size})")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        cx, cy, w, h = case["R"]
+        region = (cx - w, cx + w, cy - h, cy + h)
+        expected = case["RES"]
+
+        tree = KDTree(case["P"], leaf_size=leaf_size)
+        result = sorted(tree.iter_query(region))
+        limited = list(tree.iter_query(region, limit=3))
+
+        if (result == expected and len(limited) == min(3, len(expected))
+                and set(limited) <= set(expected) and tree.any_in(region) == bool(expected)
+                and not tree.any_in((2000, 3000, 2000, 3000))):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik iter_query KD-Tree: {passed}/{total} zaliczonych.\n")
+
 if __name__ == "__main__":
-    run_kdtree_tests()
\ No newline at end of file
+    run_kdtree_tests()
+    run_kdtree_tests(leaf_size=8)
+    run_kdtree_build_tests()
+    run_kdtree_build_tests(leaf_size=8)
+    run_kdtree_count_tests()
+    run_kdtree_count_tests(leaf_size=8)
+    run_kdtree_query_many_tests()
+    run_kdtree_query_many_tests(leaf_size=8)
+    run_kdtree_nearest_tests()
+    run_kdtree_nearest_tests(leaf_size=8)
+    run_kdtree_radius_tests()
+    run_kdtree_radius_tests(leaf_size=8)
+    run_kdtree_index_tests()
+    run_kdtree_index_tests(leaf_size=8)
+    run_kdtree_iter_tests()
+    run_kdtree_iter_tests(leaf_size=8)
\ No newline at end of file
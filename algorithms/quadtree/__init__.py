@@ -1 +1,3 @@
 from .quadtree import Point, Rectangle, QuadTree
+from .linear_quadtree import LinearQuadTree
+from .compressed_quadtree import CompressedQuadTree
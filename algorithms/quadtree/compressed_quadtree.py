@@ -0,0 +1,186 @@
+import numpy as np
+
+from algorithms.utils.arrays import as_points_array, ranges_to_indices
+
+from .linear_quadtree import LinearQuadTree, morton_codes
+
+
+def _compact_bits(v):
+    v = v & np.uint64(0x5555555555555555)
+    v = (v | (v >> np.uint64(1))) & np.uint64(0x3333333333333333)
+    v = (v | (v >> np.uint64(2))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v >> np.uint64(4))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v >> np.uint64(8))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v >> np.uint64(16))) & np.uint64(0x00000000FFFFFFFF)
+    return v
+
+
+class CompressedQuadTree:
+    """Quadtree z kompresją ścieżek i scalaniem duplikatów.
+
+    Każdy węzeł to najmniejsza komórka obejmująca jego punkty, więc łańcuchy
+    komórek z jednym niepustym dzieckiem znikają, a węzeł wewnętrzny ma co
+    najmniej dwoje dzieci. Identyczne punkty są trzymane raz, z licznikiem.
+    """
+
+    def __init__(self, points_list, capacity=4, max_depth=30):
+        self.capacity = capacity
+        self.max_depth = max_depth
+
+        pts = as_points_array(points_list)
+        self.n = len(pts)
+        # Ta sama ramka co w build_quadtree i LinearQuadTree
+        self.boundary = LinearQuadTree._boundary_for(pts) if len(pts) else None
+
+        if self.boundary is not None:
+            b = self.boundary
+            self.left = b.x - b.w
+            self.top = b.y - b.h
+            self.side = 2 * b.w
+        else:
+            self.left = self.top = 0.0
+            self.side = 1.0
+        res = 1 << max_depth
+        cell = self.side / res
+
+        ix = np.clip(np.floor((pts[:, 0] - self.left) / cell), 0, res - 1).astype(np.uint64)
+        iy = np.clip(np.floor((pts[:, 1] - self.top) / cell), 0, res - 1).astype(np.uint64)
+        codes = morton_codes(ix, iy)
+
+        # Duplikaty lądują obok siebie: kolejność po kodzie, potem po współrzędnych
+        order = np.lexsort((pts[:, 1], pts[:, 0], codes))
+        xs, ys, codes = pts[order, 0], pts[order, 1], codes[order]
+        new = np.ones(len(order), dtype=bool)
+        new[1:] = (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])
+        first = np.flatnonzero(new)
+
+        self.index = order.astype(np.intp)
+        self.starts = np.append(first, len(order)).astype(np.intp)
+        self.counts = np.diff(self.starts)
+        self.codes = codes[first]
+        self.xs = xs[first]
+        self.ys = ys[first]
+
+        self._build_nodes()
+
+    def _build_nodes(self):
+        D = self.max_depth
+        codes = self.codes
+        cap = self.capacity
+        u = len(codes)
+
+        level, prefix, lo, hi, first_child, n_children = [], [], [], [], [], []
+        height = 0
+        # Kolejka BFS: dzieci jednego węzła dostają kolejne numery
+        queue = [(0, u, 0)] if u else []
+        head = 0
+        while head < len(queue):
+            a, b, depth = queue[head]
+            head += 1
+            height = max(height, depth)
+
+            ca, cb = int(codes[a]), int(codes[b - 1])
+            L = D - ((ca ^ cb).bit_length() + 1) // 2
+            level.append(L)
+            prefix.append(ca >> 2 * (D - L))
+            lo.append(a)
+            hi.append(b)
+
+            if b - a <= cap or L == D:
+                first_child.append(-1)
+                n_children.append(0)
+                continue
+
+            shift = 2 * (D - L - 1)
+            p = ca >> 2 * (D - L)
+            bounds = np.array([(4 * p + c) << shift for c in range(5)], dtype=np.uint64)
+            cuts = (np.searchsorted(codes[a:b], bounds) + a).tolist()
+            first_child.append(len(queue))
+            k = 0
+            for c in range(4):
+                if cuts[c] < cuts[c + 1]:
+                    queue.append((cuts[c], cuts[c + 1], depth + 1))
+                    k += 1
+            n_children.append(k)
+
+        self.height = height
+        self.level = np.array(level, dtype=np.uint8)
+        self.lo = np.array(lo, dtype=np.intp)
+        self.hi = np.array(hi, dtype=np.intp)
+        self.first_child = np.array(first_child, dtype=np.intp)
+        self.n_children = np.array(n_children, dtype=np.uint8)
+
+        # Lewy górny róg komórki węzła: rozplecenie kodu dopełnionego zerami do pełnej rozdzielczości
+        full = np.array(prefix, dtype=np.uint64) << (2 * (D - self.level.astype(np.uint64)))
+        cell = self.side / (1 << D)
+        self.x0 = self.left + _compact_bits(full).astype(np.float64) * cell
+        self.y0 = self.top + _compact_bits(full >> np.uint64(1)).astype(np.float64) * cell
+        self.cell_side = self.side / np.exp2(self.level.astype(np.float64))
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def n_nodes(self):
+        return len(self.level)
+
+    @property
+    def nbytes(self):
+        arrays = (self.index, self.starts, self.counts, self.codes, self.xs, self.ys,
+                  self.level, self.lo, self.hi, self.first_child, self.n_children,
+                  self.x0, self.y0, self.cell_side)
+        return sum(a.nbytes for a in arrays)
+
+    def _intervals(self, range_rect):
+        """Zakresy punktów unikalnych: całe (bez testów) i brzegowe (do filtrowania)."""
+        qx0, qx1 = range_rect.x - range_rect.w, range_rect.x + range_rect.w
+        qy0, qy1 = range_rect.y - range_rect.h, range_rect.y + range_rect.h
+        tol = self.side * 1e-9
+
+        full, partial = [], []
+        if not self.n_nodes:
+            return full, partial
+
+        x0s, y0s, sides = self.x0, self.y0, self.cell_side
+        los, his = self.lo, self.hi
+        first_child, n_children = self.first_child, self.n_children
+        stack = [0]
+        while stack:
+            v = stack.pop()
+            x0, y0, s = float(x0s[v]), float(y0s[v]), float(sides[v])
+            x1, y1 = x0 + s, y0 + s
+
+            if x1 + tol < qx0 or x0 - tol > qx1 or y1 + tol < qy0 or y0 - tol > qy1:
+                continue
+            if x0 - tol >= qx0 and x1 + tol <= qx1 and y0 - tol >= qy0 and y1 + tol <= qy1:
+                full.append((int(los[v]), int(his[v])))
+                continue
+            k = int(n_children[v])
+            if k == 0:
+                partial.append((int(los[v]), int(his[v])))
+                continue
+            c = int(first_child[v])
+            stack.extend(range(c + k - 1, c - 1, -1))
+        return full, partial
+
+    def query_positions(self, range_rect):
+        full, partial = self._intervals(range_rect)
+        pos_full = ranges_to_indices(*(np.array(full, dtype=np.intp).reshape(-1, 2).T))
+        pos_part = ranges_to_indices(*(np.array(partial, dtype=np.intp).reshape(-1, 2).T))
+
+        x, y, w, h = range_rect.x, range_rect.y, range_rect.w, range_rect.h
+        xs = self.xs[pos_part]
+        ys = self.ys[pos_part]
+        mask = (x - w <= xs) & (xs <= x + w) & (y - h <= ys) & (ys <= y + h)
+        return np.concatenate((pos_full, pos_part[mask]))
+
+    def query(self, range_rect, return_indices=False):
+        pos = self.query_positions(range_rect)
+        if return_indices:
+            return self.index[ranges_to_indices(self.starts[pos], self.starts[pos + 1])]
+        counts = self.counts[pos]
+        return list(zip(np.repeat(self.xs[pos], counts).tolist(),
+                        np.repeat(self.ys[pos], counts).tolist()))
+
+    def count(self, range_rect):
+        return int(self.counts[self.query_positions(range_rect)].sum())
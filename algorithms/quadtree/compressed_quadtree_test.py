@@ -0,0 +1,32 @@
+from algorithms.quadtree.quadtree import Rectangle
+from algorithms.quadtree.compressed_quadtree import CompressedQuadTree
+from test_data import TEST_DATA
+
+def run_compressed_quadtree_tests():
+    print("rozpoczynam test compressed quadtree")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        # Każdy punkt trzy razy: duplikaty muszą wrócić z zapytania z krotnością
+        points = case["P"] * 3
+        expected = sorted(case["RES"] * 3)
+        q_rect = Rectangle(*case["R"])
+
+        cqt = CompressedQuadTree(points, capacity=4)
+
+        result = sorted(cqt.query(q_rect))
+        by_index = sorted(points[j] for j in cqt.query(q_rect, return_indices=True))
+
+        if (result == expected and by_index == expected and cqt.count(q_rect) == len(expected)
+                and len(cqt.xs) == len(set(case["P"]))):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik Compressed Quadtree: {passed}/{total} zaliczonych.\n")
+
+if __name__ == "__main__":
+    run_compressed_quadtree_tests()
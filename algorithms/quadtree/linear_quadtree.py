@@ -0,0 +1,176 @@
+import numpy as np
+
+from algorithms.utils.arrays import as_points_array, ranges_to_indices
+
+from .quadtree import Rectangle
+
+
+def _spread_bits(v):
+    v = v.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return v
+
+
+def morton_codes(ix, iy):
+    """Kod Z-order: bity x na pozycjach parzystych, bity y na nieparzystych."""
+    return _spread_bits(ix) | (_spread_bits(iy) << np.uint64(1))
+
+
+class LinearQuadTree:
+    """Quadtree bez wskaźników: posortowane kody Mortona liści i tablice punktów.
+
+    Komórka na poziomie L o kodzie p obejmuje kody pełnej rozdzielczości
+    [p << 2(D - L), (p + 1) << 2(D - L)), więc dzieci wyznacza się arytmetyką
+    na kodach i searchsorted w `leaf_codes` (początki komórek liści), a punkty
+    liścia k to wycinek [offsets[k], offsets[k + 1]) tablic xs / ys / index.
+    """
+
+    def __init__(self, points_list, capacity=4, max_depth=24):
+        self.capacity = capacity
+        self.max_depth = max_depth
+
+        pts = as_points_array(points_list)
+        if len(pts):
+            self.boundary = self._boundary_for(pts)
+        else:
+            self.boundary = Rectangle.from_points([])
+
+        b = self.boundary
+        self.left = b.x - b.w
+        self.top = b.y - b.h
+        self.side = 2 * b.w
+        res = 1 << max_depth
+        cell = self.side / res
+
+        ix = np.clip(np.floor((pts[:, 0] - self.left) / cell), 0, res - 1).astype(np.uint64)
+        iy = np.clip(np.floor((pts[:, 1] - self.top) / cell), 0, res - 1).astype(np.uint64)
+        codes = morton_codes(ix, iy)
+
+        order = np.argsort(codes, kind="stable")
+        self.index = order.astype(np.intp)
+        self.xs = pts[order, 0]
+        self.ys = pts[order, 1]
+
+        # Kody punktów są potrzebne tylko do wyznaczenia liści
+        self.leaf_codes, self.offsets = self._build_leaves(codes[order])
+
+    @staticmethod
+    def _boundary_for(pts):
+        # Ta sama ramka co Rectangle.from_points w build_quadtree
+        padding = 10
+        min_x, min_y = pts.min(axis=0).tolist()
+        max_x, max_y = pts.max(axis=0).tolist()
+        width = (max_x - min_x) / 2 + padding
+        height = (max_y - min_y) / 2 + padding
+        center_x = min_x + width - padding / 2
+        center_y = min_y + height - padding / 2
+        max_dim = max(width, height)
+        return Rectangle(center_x, center_y, max_dim, max_dim)
+
+    def _build_leaves(self, codes):
+        D = self.max_depth
+        n = len(codes)
+        active = np.arange(n)
+        leaf_codes, leaf_starts = [], []
+
+        for level in range(D + 1):
+            if len(active) == 0:
+                break
+            shift = np.uint64(2 * (D - level))
+            prefix = codes[active] >> shift
+            starts = np.flatnonzero(np.concatenate(([True], prefix[1:] != prefix[:-1])))
+            counts = np.diff(np.append(starts, len(active)))
+
+            is_leaf = counts <= self.capacity if level < D else np.ones(len(counts), dtype=bool)
+            leaf_codes.append(prefix[starts[is_leaf]] << shift)
+            leaf_starts.append(active[starts[is_leaf]])
+
+            in_leaf = np.repeat(is_leaf, counts)
+            active = active[~in_leaf]
+
+        if not leaf_codes:
+            return np.empty(0, dtype=np.uint64), np.zeros(1, dtype=np.intp)
+
+        leaf_codes = np.concatenate(leaf_codes)
+        leaf_starts = np.concatenate(leaf_starts)
+        order = np.argsort(leaf_starts, kind="stable")
+        offsets = np.append(leaf_starts[order], n).astype(np.intp)
+        return leaf_codes[order], offsets
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def nbytes(self):
+        arrays = (self.index, self.xs, self.ys, self.leaf_codes, self.offsets)
+        return sum(a.nbytes for a in arrays)
+
+    def _code_intervals(self, range_rect):
+        """Zakresy pozycji punktów: całe (bez testów) i brzegowe (do filtrowania)."""
+        D = self.max_depth
+        qx0, qx1 = range_rect.x - range_rect.w, range_rect.x + range_rect.w
+        qy0, qy1 = range_rect.y - range_rect.h, range_rect.y + range_rect.h
+        tol = self.side * 1e-9
+
+        full, partial = [], []
+        leaf_codes = self.leaf_codes
+        offsets = self.offsets
+        # (poziom, kod komórki, kolumna, wiersz, zakres liści)
+        stack = [(0, 0, 0, 0, 0, len(leaf_codes))] if len(leaf_codes) else []
+        while stack:
+            level, code, ix, iy, a, b = stack.pop()
+            size = self.side / (1 << level)
+            x0 = self.left + ix * size
+            y0 = self.top + iy * size
+            x1 = x0 + size
+            y1 = y0 + size
+
+            if x1 + tol < qx0 or x0 - tol > qx1 or y1 + tol < qy0 or y0 - tol > qy1:
+                continue
+            if x0 - tol >= qx0 and x1 + tol <= qx1 and y0 - tol >= qy0 and y1 + tol <= qy1:
+                full.append((int(offsets[a]), int(offsets[b])))
+                continue
+            # Komórka z jednym liściem jest tym liściem - rodzic miał więcej niż capacity punktów
+            if b - a == 1:
+                partial.append((int(offsets[a]), int(offsets[b])))
+                continue
+
+            shift = 2 * (D - level - 1)
+            bounds = np.array([(4 * code + c) << shift for c in range(5)], dtype=np.uint64)
+            cuts = (np.searchsorted(leaf_codes[a:b], bounds) + a).tolist()
+            for c in range(3, -1, -1):
+                if cuts[c] < cuts[c + 1]:
+                    stack.append((level + 1, 4 * code + c, 2 * ix + (c & 1), 2 * iy + (c >> 1),
+                                  cuts[c], cuts[c + 1]))
+        return full, partial
+
+    def query_positions(self, range_rect):
+        full, partial = self._code_intervals(range_rect)
+        pos_full = ranges_to_indices(*(np.array(full, dtype=np.intp).reshape(-1, 2).T))
+        pos_part = ranges_to_indices(*(np.array(partial, dtype=np.intp).reshape(-1, 2).T))
+
+        x, y, w, h = range_rect.x, range_rect.y, range_rect.w, range_rect.h
+        xs = self.xs[pos_part]
+        ys = self.ys[pos_part]
+        mask = (x - w <= xs) & (xs <= x + w) & (y - h <= ys) & (ys <= y + h)
+        return np.concatenate((pos_full, pos_part[mask]))
+
+    def query(self, range_rect, return_indices=False):
+        pos = self.query_positions(range_rect)
+        if return_indices:
+            return self.index[pos]
+        return list(zip(self.xs[pos].tolist(), self.ys[pos].tolist()))
+
+    def count(self, range_rect):
+        full, partial = self._code_intervals(range_rect)
+        total = sum(hi - lo for lo, hi in full)
+        x, y, w, h = range_rect.x, range_rect.y, range_rect.w, range_rect.h
+        for lo, hi in partial:
+            xs = self.xs[lo:hi]
+            ys = self.ys[lo:hi]
+            total += int(((x - w <= xs) & (xs <= x + w) & (y - h <= ys) & (ys <= y + h)).sum())
+        return total
@@ -0,0 +1,32 @@
+from algorithms.quadtree.quadtree import Rectangle, build_quadtree
+from algorithms.quadtree.linear_quadtree import LinearQuadTree
+from test_data import TEST_DATA
+
+def run_linear_quadtree_tests():
+    print("rozpoczynam test linear quadtree")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        expected = case["RES"]
+        q_rect = Rectangle(*case["R"])
+
+        lqt = LinearQuadTree(points, capacity=4)
+        qt = build_quadtree(points, capacity=4)
+
+        result = sorted(lqt.query(q_rect))
+        by_index = sorted(points[j] for j in lqt.query(q_rect, return_indices=True))
+        from_qt = sorted([(p.x, p.y) for p in qt.query(q_rect)])
+
+        if result == expected and by_index == expected and result == from_qt and lqt.count(q_rect) == len(expected):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik Linear Quadtree: {passed}/{total} zaliczonych.\n")
+
+if __name__ == "__main__":
+    run_linear_quadtree_tests()
@@ -1,6 +1,12 @@
+import heapq
 import math
+from array import array
+from itertools import islice
+import numpy as np
 
 class Point:
+    __slots__ = ("x", "y", "user_data")
+
     def __init__(self, x, y, user_data=None):
         self.x = x
         self.y = y
@@ -10,6 +16,8 @@ class Point:
         return f"({self.x:.1f}, {self.y:.1f})"
 
 class Rectangle:
+    __slots__ = ("x", "y", "w", "h")
+
     def __init__(self, x, y, w, h):
         self.x = x
         self.y = y
@@ -20,6 +28,32 @@ class Rectangle:
         return (self.x - self.w <= point.x <= self.x + self.w and
                 self.y - self.h <= point.y <= self.y + self.h)
 
+    def contains_rect(self, other):
+        return (self.x - self.w <= other.x - other.w and
+                other.x + other.w <= self.x + self.w and
+                self.y - self.h <= other.y - other.h and
+                other.y + other.h <= self.y + self.h)
+
+    def min_dist2(self, x, y):
+        dx = max(self.x - self.w - x, 0, x - self.x - self.w)
+        dy = max(self.y - self.h - y, 0, y - self.y - self.h)
+        return dx * dx + dy * dy
+
+    def max_dist2(self, x, y):
+        dx = abs(x - self.x) + self.w
+        dy = abs(y - self.y) + self.h
+        return dx * dx + dy * dy
+
+    def min_dist2_rect(self, other):
+        dx = max(abs(self.x - other.x) - self.w - other.w, 0)
+        dy = max(abs(self.y - other.y) - self.h - other.h, 0)
+        return dx * dx + dy * dy
+
+    def max_dist2_rect(self, other):
+        dx = abs(self.x - other.x) + self.w + other.w
+        dy = abs(self.y - other.y) + self.h + other.h
+        return dx * dx + dy * dy
+
     def intersects(self, other):
         return not (other.x - other.w > self.x + self.w or
                     other.x + other.w < self.x - self.w or
@@ -44,14 +78,39 @@ class Rectangle:
         max_dim = max(width, height)
         return cls(center_x, center_y, max_dim, max_dim)
 
+# Wspólna pusta lista dla węzłów wewnętrznych i pustych liści
+_NO_POINTS = ()
+
+def _cover(lo, hi):
+    # Środek i połowa boku, dla których c - r <= lo i hi <= c + r mimo zaokrągleń,
+    # więc sąsiednie komórki zbudowane z tych samych brzegów nie zostawiają szczeliny
+    c = lo / 2 + hi / 2
+    r = hi / 2 - lo / 2
+    while c - r > lo or c + r < hi:
+        r = math.nextafter(r, math.inf)
+    return c, r
+
+def _inside(lo, hi):
+    # Odwrotnie niż _cover: przedział c +- r nie wychodzi poza [lo, hi]
+    c = lo / 2 + hi / 2
+    r = hi / 2 - lo / 2
+    while r > 0 and (c - r < lo or c + r > hi):
+        r = math.nextafter(r, 0)
+    return c, r
+
 class QuadTree:
+    __slots__ = ("boundary", "capacity", "depth", "max_depth", "points", "ids",
+                 "divided", "size", "northeast", "northwest", "southeast", "southwest")
+
     def __init__(self, boundary, capacity=4, depth=0, max_depth=24):
         self.boundary = boundary
         self.capacity = capacity
         self.depth = depth
         self.max_depth = max_depth
-        self.points = []
+        self.points = _NO_POINTS
+        self.ids = _NO_POINTS
         self.divided = False
+        self.size = 0
         
         self.northeast = None
         self.northwest = None
@@ -64,10 +123,16 @@ class QuadTree:
         w = self.boundary.w
         h = self.boundary.h
 
-        ne = Rectangle(x + w/2, y - h/2, w/2, h/2)
-        nw = Rectangle(x - w/2, y - h/2, w/2, h/2)
-        se = Rectangle(x + w/2, y + h/2, w/2, h/2)
-        sw = Rectangle(x - w/2, y + h/2, w/2, h/2)
+        # Ćwiartki liczone z brzegów rodzica: x + w/2 + w/2 nie zawsze daje x + w
+        east, ew = _cover(x, x + w)
+        west, ww = _cover(x - w, x)
+        north, nh = _cover(y - h, y)
+        south, sh = _cover(y, y + h)
+
+        ne = Rectangle(east, north, ew, nh)
+        nw = Rectangle(west, north, ww, nh)
+        se = Rectangle(east, south, ew, sh)
+        sw = Rectangle(west, south, ww, sh)
 
         self.northeast = QuadTree(ne, self.capacity, self.depth + 1, self.max_depth)
         self.northwest = QuadTree(nw, self.capacity, self.depth + 1, self.max_depth)
@@ -76,33 +141,210 @@ class QuadTree:
         
         self.divided = True
 
-    def insert(self, point):
+    def insert(self, point, index=-1):
+        """Wstawia punkt; korzeń rośnie na zewnątrz, jeśli punkt leży poza jego obszarem."""
+        if not self.boundary.contains(point):
+            if not (math.isfinite(point.x) and math.isfinite(point.y)):
+                return False
+            while not self.boundary.contains(point):
+                if not self._grow_towards(point):
+                    return False
+        return self._insert(point, index)
+
+    def _grow_towards(self, point):
+        # Nowy korzeń o podwójnym boku przejmuje stary jako jedną ćwiartkę.
+        # Głębokość korzenia maleje zamiast przenumerowywać całe poddrzewo.
+        # Zwraca False, gdy obszaru nie da się powiększyć.
+        b = self.boundary
+        if b.w <= 0 or b.h <= 0:
+            # Podwajanie zerowego boku nic nie daje; pusty lub niepodzielony
+            # liść dostaje od razu kwadrat sięgający do punktu
+            if self.divided:
+                return False
+            extent = max(b.w, b.h, abs(point.x - b.x), abs(point.y - b.y))
+            self.boundary = Rectangle(b.x, b.y, extent, extent)
+            return math.isfinite(extent)
+
+        east = point.x >= b.x
+        south = point.y >= b.y
+        # float, żeby przepełnienie dało inf zamiast rosnącej bez końca liczby całkowitej
+        x, y, w, h = float(b.x), float(b.y), float(b.w), float(b.h)
+        left, right, top, bottom = x - w, x + w, y - h, y + h
+        # Kolumny (zachód, wschód) i wiersze (północ, południe) nowego korzenia;
+        # stary korzeń zajmuje dokładnie swoje brzegi, rodzeństwo jest budowane z nich
+        if east:
+            cols = ((left, right), (right, right + (right - left)))
+        else:
+            cols = ((left - (right - left), left), (left, right))
+        if south:
+            rows = ((top, bottom), (bottom, bottom + (bottom - top)))
+        else:
+            rows = ((top - (bottom - top), top), (top, bottom))
+
+        # Korzeń nie wychodzi poza sumę dzieci, więc każdy jego punkt ma dziecko
+        gx, gw = _inside(cols[0][0], cols[1][1])
+        gy, gh = _inside(rows[0][0], rows[1][1])
+        if not all(math.isfinite(v) for v in (gx, gy, gw, gh, cols[0][0], cols[1][1],
+                                               rows[0][0], rows[1][1])):
+            return False
+        grown = Rectangle(gx, gy, gw, gh)
+        if not self.divided:
+            self.boundary = grown
+            self.depth -= 1
+            return True
+
+        old = QuadTree(b, self.capacity, self.depth, self.max_depth)
+        old.size = self.size
+        old.divided = True
+        old.northeast, old.northwest = self.northeast, self.northwest
+        old.southeast, old.southwest = self.southeast, self.southwest
+
+        old_cell = (0 if east else 1, 0 if south else 1)
+        children = []
+        for cell in ((1, 0), (0, 0), (1, 1), (0, 1)):
+            if cell == old_cell:
+                children.append(old)
+                continue
+            cx, cw = _cover(*cols[cell[0]])
+            cy, ch = _cover(*rows[cell[1]])
+            children.append(QuadTree(Rectangle(cx, cy, cw, ch), self.capacity, self.depth, self.max_depth))
+
+        self.boundary = grown
+        self.depth -= 1
+        self.northeast, self.northwest, self.southeast, self.southwest = children
+        self.divided = True
+        return True
+
+    def _insert(self, point, index=-1):
         if not self.boundary.contains(point):
             return False
 
         if self.divided:
-            return self._insert_into_children(point)
+            if self._insert_into_children(point, index):
+                self.size += 1
+                return True
+            return False
 
+        if not self.points:
+            self.points = []
+            self.ids = array("q")
         self.points.append(point)
+        self.ids.append(index)
+        self.size += 1
 
         if len(self.points) > self.capacity and self.depth < self.max_depth:
             self.subdivide()
-            while self.points:
-                p = self.points.pop()
-                self._insert_into_children(p)
+            points, ids = self.points, self.ids
+            self.points = self.ids = _NO_POINTS
+            while points:
+                p = points.pop()
+                i = ids.pop()
+                self._insert_into_children(p, i)
             
         return True
 
-    def _insert_into_children(self, point):
-        if self.northeast.insert(point): return True
-        if self.northwest.insert(point): return True
-        if self.southeast.insert(point): return True
-        if self.southwest.insert(point): return True
+    def _insert_into_children(self, point, index=-1):
+        if self.northeast._insert(point, index): return True
+        if self.northwest._insert(point, index): return True
+        if self.southeast._insert(point, index): return True
+        if self.southwest._insert(point, index): return True
         return False
 
-    def query(self, range_rect, found_points):
+    def _find_path(self, point, path):
+        path.append(self)
+        if not self.divided:
+            if any(p is point for p in self.points):
+                return path
+        else:
+            for child in (self.northeast, self.northwest, self.southeast, self.southwest):
+                if child.boundary.contains(point) and child._find_path(point, path):
+                    return path
+        path.pop()
+        return None
+
+    def _take_from_leaf(self, point):
+        j = next(j for j, p in enumerate(self.points) if p is point)
+        del self.points[j]
+        index = self.ids.pop(j)
+        if not self.points:
+            self.points = self.ids = _NO_POINTS
+        return index
+
+    def _collapse(self):
+        points = self._report_subtree([])
+        ids = self._report_subtree_ids(array("q"))
+        self.northeast = self.northwest = self.southeast = self.southwest = None
+        self.divided = False
+        self.points = points if points else _NO_POINTS
+        self.ids = ids if points else _NO_POINTS
+
+    def _collapse_path(self, path):
+        # Rozmiary maleją w dół ścieżki, więc wystarczy zwinąć najwyższy kwalifikujący się węzeł
+        for node in path:
+            if node.divided and node.size <= node.capacity:
+                node._collapse()
+                return
+
+    def remove(self, point):
+        path = self._find_path(point, [])
+        if path is None:
+            return False
+
+        path[-1]._take_from_leaf(point)
+        for node in path:
+            node.size -= 1
+        self._collapse_path(path)
+        return True
+
+    def move(self, point, new_x, new_y):
+        path = self._find_path(point, [])
+        if path is None:
+            return False
+
+        leaf = path[-1]
+        target = Point(new_x, new_y)
+        if leaf.boundary.contains(target):
+            point.x, point.y = new_x, new_y
+            return True
+
+        k = len(path) - 2
+        while k >= 0 and not path[k].boundary.contains(target):
+            k -= 1
+        if k < 0:
+            # Poza korzeniem: usunięcie i wstawienie od góry, z ewentualnym wzrostem korzenia
+            if not (math.isfinite(new_x) and math.isfinite(new_y)):
+                return False
+            index = leaf._take_from_leaf(point)
+            for node in path:
+                node.size -= 1
+            self._collapse_path(path)
+            point.x, point.y = new_x, new_y
+            return self.insert(point, index)
+
+        index = leaf._take_from_leaf(point)
+        for node in path[k + 1:]:
+            node.size -= 1
+        self._collapse_path(path[k + 1:])
+
+        # path[k] jest węzłem wewnętrznym, którego obszar obejmuje nową pozycję,
+        # więc punkt trafia do jednego z jego dzieci, a rozmiary wyżej się nie zmieniają
+        point.x, point.y = new_x, new_y
+        if path[k]._insert_into_children(point, index):
+            return True
+        for node in path[:k + 1]:
+            node.size -= 1
+        return False
+
+    def query(self, range_rect, found_points=None, return_indices=False):
+        if return_indices:
+            return np.array(self._query_ids(range_rect, []), dtype=np.intp)
+        if found_points is None:
+            found_points = []
+
         if not self.boundary.intersects(range_rect):
             return found_points
+        if range_rect.contains_rect(self.boundary):
+            return self._report_subtree(found_points)
 
         for point in self.points:
             if range_rect.contains(point):
@@ -116,7 +358,305 @@ class QuadTree:
 
         return found_points
 
-def build_quadtree(points_list, capacity=4, max_depth=24):
+    def iter_query(self, range_rect, limit=None):
+        """Leniwa wersja query: punkty są zwracane w miarę przechodzenia drzewa."""
+        return islice(self._iter_search(range_rect), limit)
+
+    def any_in(self, range_rect):
+        for _ in self._iter_search(range_rect):
+            return True
+        return False
+
+    def _iter_search(self, range_rect):
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if not node.boundary.intersects(range_rect):
+                continue
+            if range_rect.contains_rect(node.boundary):
+                yield from node._iter_subtree()
+                continue
+
+            for point in node.points:
+                if range_rect.contains(point):
+                    yield point
+
+            if node.divided:
+                stack.append(node.southeast)
+                stack.append(node.southwest)
+                stack.append(node.northeast)
+                stack.append(node.northwest)
+
+    def _iter_subtree(self):
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield from node.points
+            if node.divided:
+                stack.append(node.southeast)
+                stack.append(node.southwest)
+                stack.append(node.northeast)
+                stack.append(node.northwest)
+
+    def _query_ids(self, range_rect, found_ids):
+        if not self.boundary.intersects(range_rect):
+            return found_ids
+        if range_rect.contains_rect(self.boundary):
+            return self._report_subtree_ids(found_ids)
+
+        for point, i in zip(self.points, self.ids):
+            if range_rect.contains(point):
+                found_ids.append(i)
+
+        if self.divided:
+            self.northwest._query_ids(range_rect, found_ids)
+            self.northeast._query_ids(range_rect, found_ids)
+            self.southwest._query_ids(range_rect, found_ids)
+            self.southeast._query_ids(range_rect, found_ids)
+
+        return found_ids
+
+    def _report_subtree(self, found_points):
+        found_points.extend(self.points)
+        if self.divided:
+            self.northwest._report_subtree(found_points)
+            self.northeast._report_subtree(found_points)
+            self.southwest._report_subtree(found_points)
+            self.southeast._report_subtree(found_points)
+        return found_points
+
+    def _report_subtree_ids(self, found_ids):
+        found_ids.extend(self.ids)
+        if self.divided:
+            self.northwest._report_subtree_ids(found_ids)
+            self.northeast._report_subtree_ids(found_ids)
+            self.southwest._report_subtree_ids(found_ids)
+            self.southeast._report_subtree_ids(found_ids)
+        return found_ids
+
+    def query_radius(self, center, r, found_points):
+        cx, cy = center
+        r2 = r * r
+        if self.boundary.min_dist2(cx, cy) > r2:
+            return found_points
+        if self.boundary.max_dist2(cx, cy) <= r2:
+            return self._report_subtree(found_points)
+
+        for point in self.points:
+            if (point.x - cx) ** 2 + (point.y - cy) ** 2 <= r2:
+                found_points.append(point)
+
+        if self.divided:
+            self.northwest.query_radius(center, r, found_points)
+            self.northeast.query_radius(center, r, found_points)
+            self.southwest.query_radius(center, r, found_points)
+            self.southeast.query_radius(center, r, found_points)
+
+        return found_points
+
+    def nearest(self, point, k=1):
+        """k najbliższych punktów do `point`, posortowane rosnąco po odległości."""
+        qx, qy = (point.x, point.y) if isinstance(point, Point) else point
+        return [p for _, _, p, _ in self._nearest_sorted(qx, qy, k)]
+
+    def nearest_many(self, points, k=1):
+        """kNN dla macierzy (m, 2) punktów, jak KDTree.nearest_many.
+
+        Zwraca (distances, indices) o kształcie (m, k); indeksy to numery punktów
+        z build_quadtree, brakujące miejsca mają odległość inf i indeks -1.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        m = len(points)
+        distances = np.full((m, k), np.inf)
+        indices = np.full((m, k), -1, dtype=np.intp)
+        for q, (x, y) in enumerate(points.tolist()):
+            for j, (d2, _, _, index) in enumerate(self._nearest_sorted(x, y, k)):
+                distances[q, j] = d2 ** 0.5
+                indices[q, j] = index
+        return distances, indices
+
+    def _nearest_sorted(self, qx, qy, k):
+        # Best-first: kolejka węzłów po min. odległości do boundary,
+        # kopiec max najlepszych k: (-d^2, kolejność, punkt, indeks)
+        best = []
+        if k <= 0 or self.size == 0:
+            return best
+        queue = [(self.boundary.min_dist2(qx, qy), 0, self)]
+        tick = 1
+        seen = 0
+        while queue:
+            d2_node, _, node = heapq.heappop(queue)
+            if len(best) == k and d2_node > -best[0][0]:
+                break
+            if node.divided:
+                for child in (node.northeast, node.northwest, node.southeast, node.southwest):
+                    if child.size:
+                        heapq.heappush(queue, (child.boundary.min_dist2(qx, qy), tick, child))
+                        tick += 1
+                continue
+            for p, index in zip(node.points, node.ids):
+                d2 = (p.x - qx) ** 2 + (p.y - qy) ** 2
+                if len(best) < k:
+                    heapq.heappush(best, (-d2, seen, p, index))
+                elif d2 < -best[0][0]:
+                    heapq.heapreplace(best, (-d2, seen, p, index))
+                seen += 1
+        best.sort(key=lambda e: (-e[0], e[1]))
+        return [(-neg_d2, order, p, index) for neg_d2, order, p, index in best]
+
+    def pairs_within(self, d):
+        """Pary indeksów punktów odległych o co najwyżej d, każda raz, jako tablica (m, 2)."""
+        d2 = d * d
+        first, second = array("q"), array("q")
+        # Przechodzenie par węzłów; (a, a) oznacza pary wewnątrz jednego poddrzewa
+        stack = [(self, self)]
+        while stack:
+            a, b = stack.pop()
+            if not a.size or not b.size:
+                continue
+            if a is not b and a.boundary.min_dist2_rect(b.boundary) > d2:
+                continue
+
+            if a.boundary.max_dist2_rect(b.boundary) <= d2:
+                ids_a = a._report_subtree_ids(array("q"))
+                if a is b:
+                    for j in range(1, len(ids_a)):
+                        first.extend(ids_a[:j])
+                        second.extend(array("q", [ids_a[j]]) * j)
+                else:
+                    ids_b = b._report_subtree_ids(array("q"))
+                    for i in ids_a:
+                        first.extend(array("q", [i]) * len(ids_b))
+                        second.extend(ids_b)
+                continue
+
+            if not a.divided and not b.divided:
+                if a is b:
+                    pts = list(zip(a.points, a.ids))
+                    for j, (q, qi) in enumerate(pts):
+                        for p, pi in pts[:j]:
+                            if (p.x - q.x) ** 2 + (p.y - q.y) ** 2 <= d2:
+                                first.append(pi)
+                                second.append(qi)
+                else:
+                    for p, pi in zip(a.points, a.ids):
+                        for q, qi in zip(b.points, b.ids):
+                            if (p.x - q.x) ** 2 + (p.y - q.y) ** 2 <= d2:
+                                first.append(pi)
+                                second.append(qi)
+                continue
+
+            if a is b:
+                children = (a.northeast, a.northwest, a.southeast, a.southwest)
+                for i, c in enumerate(children):
+                    stack.append((c, c))
+                    stack.extend((c, c2) for c2 in children[i + 1:])
+            elif a.divided and (not b.divided or a.boundary.w >= b.boundary.w):
+                stack.extend((c, b) for c in (a.northeast, a.northwest, a.southeast, a.southwest))
+            else:
+                stack.extend((a, c) for c in (b.northeast, b.northwest, b.southeast, b.southwest))
+
+        pairs = np.empty((len(first), 2), dtype=np.intp)
+        pairs[:, 0] = np.frombuffer(first, dtype=np.int64)
+        pairs[:, 1] = np.frombuffer(second, dtype=np.int64)
+        return pairs
+
+    def count(self, range_rect):
+        if not self.boundary.intersects(range_rect):
+            return 0
+        if range_rect.contains_rect(self.boundary):
+            return self.size
+
+        total = 0
+        for point in self.points:
+            if range_rect.contains(point):
+                total += 1
+
+        if self.divided:
+            total += self.northwest.count(range_rect)
+            total += self.northeast.count(range_rect)
+            total += self.southwest.count(range_rect)
+            total += self.southeast.count(range_rect)
+
+        return total
+
+def _contains_mask(rects, xs, ys):
+    # To samo wyrażenie co Rectangle.contains, więc identyczne zaokrąglenia
+    x, y, w, h = rects[:, 0], rects[:, 1], rects[:, 2], rects[:, 3]
+    return (x - w <= xs) & (xs <= x + w) & (y - h <= ys) & (ys <= y + h)
+
+def _bulk_load(qt, points_objects):
+    """Buduje drzewo identyczne z wynikiem kolejnych qt.insert(p, i).
+
+    Zamiast schodzić od korzenia dla każdego punktu, przetwarza całe poziomy
+    naraz. Każdy węzeł dostaje swoje punkty w kolejności, w jakiej trafiłyby do
+    niego przy wstawianiu pojedynczym: po przepełnieniu pierwsze capacity + 1
+    punktów jest zdejmowanych z końca listy (odwrócona kolejność), a kolejne
+    przechodzą dalej w kolejności przybycia.
+    """
+    cap = qt.capacity
+    xs = np.fromiter((p.x for p in points_objects), dtype=np.float64, count=len(points_objects))
+    ys = np.fromiter((p.y for p in points_objects), dtype=np.float64, count=len(points_objects))
+
+    b = qt.boundary
+    root_rect = np.array([[b.x, b.y, b.w, b.h]], dtype=np.float64)
+    seq = np.flatnonzero(_contains_mask(root_rect, xs, ys))
+
+    nodes = [qt]
+    counts = np.array([len(seq)])
+    while nodes:
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        seq_node = np.repeat(np.arange(len(nodes)), counts)
+
+        split_rank = np.full(len(nodes), -1)
+        child_rects = []
+        seq_list = seq.tolist()
+        for j, (node, start, count) in enumerate(zip(nodes, starts.tolist(), counts.tolist())):
+            if count > cap and node.depth < node.max_depth:
+                node.subdivide()
+                split_rank[j] = len(child_rects)
+                child_rects.append([(c.boundary.x, c.boundary.y, c.boundary.w, c.boundary.h)
+                                    for c in (node.northeast, node.northwest,
+                                              node.southeast, node.southwest)])
+            elif count:
+                node.ids = array("q", seq_list[start:start + count])
+                node.points = [points_objects[i] for i in node.ids]
+                node.size = count
+
+        if not child_rects:
+            break
+
+        sel = split_rank[seq_node] >= 0
+        pts = seq[sel]
+        owner = seq_node[sel]
+        rank = np.arange(len(seq))[sel] - starts[owner]
+        key = np.where(rank <= cap, cap - rank, rank)
+
+        rects = np.asarray(child_rects, dtype=np.float64)[split_rank[owner]]
+        child = np.full(len(pts), -1)
+        for c in range(3, -1, -1):
+            child[_contains_mask(rects[:, c], xs[pts], ys[pts])] = c
+
+        # Rozmiar jak przy insert: pierwsze cap + 1 punktów liczy się zawsze,
+        # późniejsze tylko gdy trafiły do któregoś z dzieci
+        late_ok = np.bincount(owner[(rank > cap) & (child >= 0)], minlength=len(nodes))
+
+        next_nodes = []
+        for j, node in enumerate(nodes):
+            if split_rank[j] >= 0:
+                node.size = cap + 1 + int(late_ok[j])
+                next_nodes.extend((node.northeast, node.northwest, node.southeast, node.southwest))
+
+        keep = child >= 0
+        next_id = split_rank[owner[keep]] * 4 + child[keep]
+        order = np.lexsort((key[keep], next_id))
+        seq = pts[keep][order]
+        counts = np.bincount(next_id, minlength=len(next_nodes))
+        nodes = next_nodes
+
+    return qt
+
+def build_quadtree(points_list, capacity=4, max_depth=24, build="bulk"):
     points_objects = []
     for p in points_list:
         if isinstance(p, (tuple, list)):
@@ -127,7 +667,10 @@ def build_quadtree(points_list, capacity=4, max_depth=24):
     optimal_boundary = Rectangle.from_points(points_objects)
     
     qt = QuadTree(optimal_boundary, capacity, 0, max_depth)
-    for p in points_objects:
-        qt.insert(p)
+    if build == "bulk":
+        return _bulk_load(qt, points_objects)
+
+    for i, p in enumerate(points_objects):
+        qt.insert(p, i)
 
     return qt
\ No newline at end of file
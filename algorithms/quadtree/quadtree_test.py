@@ -1,4 +1,6 @@
-from algorithms.quadtree.quadtree import Rectangle, Point, build_quadtree
+import random
+
+from algorithms.quadtree.quadtree import QuadTree, Rectangle, Point, build_quadtree
 from test_data import TEST_DATA
 
 def run_quadtree_tests():
@@ -30,5 +32,315 @@ def run_quadtree_tests():
 
     print(f"\nWynik Quadtree: {passed}/{total} zaliczonych.\n")
 
+def run_quadtree_count_tests():
+    print("rozpoczynam test count quadtree")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        qt = build_quadtree(case["P"], capacity=4)
+        q_rect = Rectangle(*case["R"])
+
+        result = qt.count(q_rect)
+
+        if result == len(case["RES"]) and qt.size == len(case["P"]):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(case['RES'])}, Otrzymano: {result}")
+
+    print(f"\nWynik count Quadtree: {passed}/{total} zaliczonych.\n")
+
+def run_quadtree_radius_tests():
+    print("rozpoczynam test query_radius quadtree")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        cx, cy, w, h = case["R"]
+        r = min(w, h)
+        expected = sorted(p for p in points if (p[0] - cx) ** 2 + (p[1] - cy) ** 2 <= r * r)
+
+        qt = build_quadtree(points, capacity=4)
+        found_objs = qt.query_radius((cx, cy), r, [])
+        result = sorted([(p.x, p.y) for p in found_objs])
+
+        if result == expected:
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik query_radius Quadtree: {passed}/{total} zaliczonych.\n")
+
+def run_quadtree_index_tests():
+    print("rozpoczynam test indeksów quadtree")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        qt = build_quadtree(points, capacity=4)
+        q_rect = Rectangle(*case["R"])
+
+        indices = qt.query(q_rect, return_indices=True)
+        result = sorted(points[j] for j in indices)
+
+        if result == case["RES"] and len(set(indices.tolist())) == len(indices):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(case['RES'])}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik indeksów Quadtree: {passed}/{total} zaliczonych.\n")
+
+def run_quadtree_iter_tests():
+    print("rozpoczynam test iter_query quadtree")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        expected = case["RES"]
+        qt = build_quadtree(case["P"], capacity=4)
+        q_rect = Rectangle(*case["R"])
+
+        result = sorted([(p.x, p.y) for p in qt.iter_query(q_rect)])
+        limited = [(p.x, p.y) for p in qt.iter_query(q_rect, limit=3)]
+
+        if (result == expected and len(limited) == min(3, len(expected))
+                and set(limited) <= set(expected) and qt.any_in(q_rect) == bool(expected)
+                and not qt.any_in(Rectangle(5000, 5000, 10, 10))):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik iter_query Quadtree: {passed}/{total} zaliczonych.\n")
+
+def _structure(node, out):
+    b = node.boundary
+    out.append((b.x, b.y, b.w, b.h, node.divided, node.size,
+                [(p.x, p.y) for p in node.points], list(node.ids)))
+    if node.divided:
+        for child in (node.northeast, node.northwest, node.southeast, node.southwest):
+            _structure(child, out)
+    return out
+
+def run_quadtree_build_tests():
+    print("rozpoczynam test budowy quadtree (insert vs bulk)")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"] + case["P"][:10]
+
+        qt_insert = build_quadtree(points, capacity=4, build="insert")
+        qt_bulk = build_quadtree(points, capacity=4, build="bulk")
+
+        if _structure(qt_insert, []) == _structure(qt_bulk, []):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+
+    print(f"\nWynik budowy Quadtree: {passed}/{total} zaliczonych.\n")
+
+def run_quadtree_nearest_tests(k=5):
+    print(f"rozpoczynam test nearest quadtree (k={k})")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        cx, cy = case["R"][0], case["R"][1]
+
+        def dist(p):
+            return ((p[0] - cx) ** 2 + (p[1] - cy) ** 2) ** 0.5
+
+        expected = sorted(dist(p) for p in points)[:k]
+
+        qt = build_quadtree(points, capacity=4)
+        result = [dist((p.x, p.y)) for p in qt.nearest((cx, cy), k)]
+        distances, indices = qt.nearest_many([(cx, cy)], k)
+        from_many = [dist(points[j]) for j in indices[0]]
+
+        if result == expected and from_many == expected and list(distances[0]) == expected:
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {expected}, Otrzymano: {result}")
+
+    print(f"\nWynik nearest Quadtree: {passed}/{total} zaliczonych.\n")
+
+def run_quadtree_pairs_tests():
+    print("rozpoczynam test pairs_within quadtree")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        # Duplikaty i bardzo bliskie punkty, żeby objąć całe poddrzewa
+        points = case["P"] + case["P"][:5] + [(x + 0.01, y) for x, y in case["P"][:5]]
+        d = min(case["R"][2], case["R"][3]) / 4
+
+        expected = {(a, b) for a in range(len(points)) for b in range(a + 1, len(points))
+                    if (points[a][0] - points[b][0]) ** 2 + (points[a][1] - points[b][1]) ** 2 <= d * d}
+
+        qt = build_quadtree(points, capacity=4)
+        pairs = qt.pairs_within(d)
+        result = {(min(a, b), max(a, b)) for a, b in pairs.tolist()}
+
+        if result == expected and len(pairs) == len(expected) and pairs.shape[1:] == (2,):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik pairs_within Quadtree: {passed}/{total} zaliczonych.\n")
+
+def _divided_sizes_ok(node):
+    if not node.divided:
+        return node.size == len(node.points)
+    children = (node.northeast, node.northwest, node.southeast, node.southwest)
+    return (node.size > node.capacity and node.size == sum(c.size for c in children)
+            and all(_divided_sizes_ok(c) for c in children))
+
+def _node_edges(node, edges):
+    b = node.boundary
+    edges.append((b.x - b.w, b.x + b.w, b.y - b.h, b.y + b.h))
+    if node.divided:
+        for c in (node.northeast, node.northwest, node.southeast, node.southwest):
+            _node_edges(c, edges)
+    return edges
+
+def run_quadtree_remove_tests():
+    print("rozpoczynam test remove/move quadtree")
+    passed = 0
+    total = len(TEST_DATA)
+    rng = random.Random(0)
+
+    for i, case in enumerate(TEST_DATA):
+        points_objs = [Point(p[0], p[1]) for p in case["P"]]
+        qt = build_quadtree(points_objs, capacity=4)
+        q_rect = Rectangle(*case["R"])
+
+        removed = rng.sample(points_objs, len(points_objs) // 3)
+        live = [p for p in points_objs if all(p is not r for r in removed)]
+        ok = all(qt.remove(p) for p in removed) and not qt.remove(removed[0])
+
+        for p in rng.sample(live, len(live) // 2):
+            new_x, new_y = p.x + rng.uniform(-50, 50), p.y + rng.uniform(-50, 50)
+            ok = qt.move(p, new_x, new_y) and ok
+        expected = sorted((p.x, p.y) for p in live if q_rect.contains(p))
+        result = sorted([(p.x, p.y) for p in qt.query(q_rect)])
+
+        if ok and result == expected and qt.size == len(live) and _divided_sizes_ok(qt):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik remove/move Quadtree: {passed}/{total} zaliczonych.\n")
+
+def run_quadtree_grow_tests():
+    print("rozpoczynam test rozrostu korzenia quadtree")
+    passed = 0
+    total = len(TEST_DATA)
+    rng = random.Random(1)
+
+    for i, case in enumerate(TEST_DATA):
+        points_objs = [Point(p[0], p[1]) for p in case["P"]]
+        qt = build_quadtree(points_objs, capacity=4)
+        b = qt.boundary
+        q_rect = Rectangle(*case["R"])
+
+        # Punkty daleko poza pierwotną ramką, we wszystkich kierunkach
+        extra = [Point(b.x + rng.choice((-1, 1)) * rng.uniform(1, 20) * b.w,
+                       b.y + rng.choice((-1, 1)) * rng.uniform(1, 20) * b.h)
+                 for _ in range(30)]
+        ok = all(qt.insert(p) for p in extra)
+        ok = ok and not qt.insert(Point(float("inf"), 0))
+
+        everything = points_objs + extra
+        expected = sorted((p.x, p.y) for p in everything if q_rect.contains(p))
+        result = sorted((p.x, p.y) for p in qt.query(q_rect))
+        all_found = sorted((p.x, p.y) for p in qt.query(qt.boundary))
+
+        if (ok and result == expected and qt.size == len(everything)
+                and all_found == sorted((p.x, p.y) for p in everything)
+                and _divided_sizes_ok(qt)):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    # Zdegenerowane ramki: zerowy bok nie może się podwajać, a przepełnienie kończy wzrost
+    total += 1
+    flat = QuadTree(Rectangle(0, 0, 0, 0))
+    thin = QuadTree(Rectangle(0, 0, 0, 5))
+    stacked = QuadTree(Rectangle(0, 0, 0, 0), capacity=1)
+    ok = stacked.insert(Point(0, 0)) and stacked.insert(Point(0, 0)) and stacked.divided
+    huge = QuadTree(Rectangle(0, 0, 1, 1))
+    if (ok and flat.insert(Point(1, 1)) and flat.insert(Point(-3, 2)) and flat.size == 2
+            and thin.insert(Point(1, 1)) and not stacked.insert(Point(1, 1))
+            and huge.insert(Point(8e307, 8e307)) and not huge.insert(Point(-1.7e308, 0))
+            and not huge.insert(Point(1.7e308, 1.7e308))):
+        print(f"Test {total}/{total}: ZALICZONY")
+        passed += 1
+    else:
+        print(f"Test {total}/{total}: BŁĄD! (zdegenerowana ramka)")
+
+    # Punkty dokładnie na brzegach węzłów (także po wzroście korzenia) nie mogą przepaść
+    total += 1
+    seam_rng = random.Random(5)
+    ok = True
+    for _ in range(100):
+        points_objs = [Point(seam_rng.uniform(-7, 7), seam_rng.uniform(-7, 7)) for _ in range(40)]
+        qt = build_quadtree(points_objs, capacity=2)
+        for _ in range(3):
+            b = qt.boundary
+            grown = Point(b.x + seam_rng.choice((-1, 1)) * 3 * b.w, b.y + seam_rng.choice((-1, 1)) * 3 * b.h)
+            ok = ok and qt.insert(grown)
+            points_objs.append(grown)
+        edges = _node_edges(qt, [])
+        for _ in range(30):
+            left, right, top, bottom = seam_rng.choice(edges)
+            if seam_rng.random() < 0.5:
+                p = Point(seam_rng.choice((left, right)), seam_rng.uniform(top, bottom))
+            else:
+                p = Point(seam_rng.uniform(left, right), seam_rng.choice((top, bottom)))
+            ok = ok and qt.insert(p)
+            points_objs.append(p)
+        moved = seam_rng.choice(points_objs)
+        left, right, top, bottom = seam_rng.choice(edges)
+        ok = ok and qt.move(moved, left, seam_rng.uniform(top, bottom))
+        ok = (ok and qt.size == len(points_objs) and _divided_sizes_ok(qt)
+              and len(qt.query(qt.boundary)) == len(points_objs))
+    if ok:
+        print(f"Test {total}/{total}: ZALICZONY")
+        passed += 1
+    else:
+        print(f"Test {total}/{total}: BŁĄD! (punkty na brzegach węzłów)")
+
+    print(f"\nWynik rozrostu Quadtree: {passed}/{total} zaliczonych.\n")
+
 if __name__ == "__main__":
-    run_quadtree_tests()
\ No newline at end of file
+    run_quadtree_tests()
+    run_quadtree_count_tests()
+    run_quadtree_radius_tests()
+    run_quadtree_index_tests()
+    run_quadtree_iter_tests()
+    run_quadtree_build_tests()
+    run_quadtree_remove_tests()
+    run_quadtree_grow_tests()
+    run_quadtree_nearest_tests()
+    run_quadtree_nearest_tests(k=1)
+    run_quadtree_pairs_tests()
\ No newline at end of file
@@ -0,0 +1 @@
+from .range_tree import RangeTree
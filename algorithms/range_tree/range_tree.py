@@ -0,0 +1,163 @@
+from itertools import islice
+
+import numpy as np
+
+
+class RangeTree:
+    """Dwuwymiarowe drzewo przedziałowe z kaskadowaniem ułamkowym.
+
+    Drzewo po x jest niejawne: węzeł to przedział [lo, hi) pozycji w porządku
+    po x, dzielony w połowie. Poziom d przechowuje listy y wszystkich swoich
+    węzłów jedna za drugą (`pos[d]` - pozycje po x w kolejności (y, x)),
+    więc węzeł [lo, hi) zajmuje dokładnie wycinek [lo, hi) poziomu. `cum[d]`
+    to prefiksowa liczba elementów idących do lewego dziecka - zamiast
+    wyszukiwania binarnego w dzieciach zakres y przelicza się arytmetyką.
+    Zapytanie kosztuje O(log n + k) przy pamięci O(n log n).
+    """
+
+    def __init__(self, points, eps=1e-9, leaf_size=8):
+        self.eps = eps
+        self.leaf_size = max(1, int(leaf_size))
+
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        n = len(pts)
+        self.n = n
+        idx_dtype = np.int32 if n < np.iinfo(np.int32).max else np.int64
+
+        # Ten sam porządek co w KDTree: (x, y, i)
+        order = np.lexsort((np.arange(n), pts[:, 1], pts[:, 0]))
+        self.index = order.astype(np.intp)
+        self.xs = pts[order, 0]
+        self.ys = pts[order, 1]
+
+        top = np.lexsort((np.arange(n), self.ys)).astype(idx_dtype)
+        self.root_ys = self.ys[top]
+        self.pos = [top]
+        self.cum = []
+
+        # Granice węzłów bieżącego poziomu; poziomy powstają, dopóki jakiś węzeł jest za duży
+        bounds = [(0, n)] if n else []
+        while any(hi - lo > self.leaf_size for lo, hi in bounds):
+            cur = self.pos[-1]
+            mid_of = np.empty(n, dtype=np.int64)
+            next_bounds = []
+            for lo, hi in bounds:
+                if hi - lo > self.leaf_size:
+                    mid = (lo + hi) // 2
+                    mid_of[lo:hi] = mid
+                    next_bounds.extend(((lo, mid), (mid, hi)))
+                else:
+                    # Liść przechodzi na kolejny poziom bez zmian (wszystko "w lewo")
+                    mid_of[lo:hi] = hi
+                    next_bounds.append((lo, hi))
+
+            goes_left = cur < mid_of
+            cum = np.zeros(n + 1, dtype=idx_dtype)
+            np.cumsum(goes_left, out=cum[1:])
+
+            lo_of = np.repeat([lo for lo, _ in bounds], [hi - lo for lo, hi in bounds])
+            e = np.arange(n)
+            left_rank = cum[e] - cum[lo_of]
+            new_pos = np.where(goes_left, lo_of + left_rank, mid_of + (e - lo_of) - left_rank)
+
+            nxt = np.empty(n, dtype=idx_dtype)
+            nxt[new_pos] = cur
+            self.cum.append(cum)
+            self.pos.append(nxt)
+            bounds = next_bounds
+
+    @property
+    def nbytes(self):
+        arrays = [self.index, self.xs, self.ys, self.root_ys] + self.pos + self.cum
+        return sum(a.nbytes for a in arrays)
+
+    def _ranges(self, region):
+        """Kanoniczne wycinki poziomów (całe w zapytaniu) i liście do filtrowania po x."""
+        full, partial = [], []
+        for d, i, j, is_full in self._iter_ranges(region):
+            (full if is_full else partial).append((d, i, j))
+        return full, partial
+
+    def _iter_ranges(self, region):
+        x_min, x_max, y_min, y_max = region
+        EPS = self.eps
+        if self.n == 0:
+            return
+
+        a = int(np.searchsorted(self.xs, x_min - EPS, side="left"))
+        b = int(np.searchsorted(self.xs, x_max + EPS, side="right"))
+        i = int(np.searchsorted(self.root_ys, y_min - EPS, side="left"))
+        j = int(np.searchsorted(self.root_ys, y_max + EPS, side="right"))
+        if a >= b or i >= j:
+            return
+
+        leaf_size = self.leaf_size
+        cum = self.cum
+        stack = [(0, 0, self.n, i, j)]
+        while stack:
+            d, lo, hi, i, j = stack.pop()
+            if i >= j or hi <= a or lo >= b:
+                continue
+            if a <= lo and hi <= b:
+                yield d, i, j, True
+                continue
+            if hi - lo <= leaf_size:
+                yield d, i, j, False
+                continue
+
+            mid = (lo + hi) // 2
+            c = cum[d]
+            base = int(c[lo])
+            li = int(c[i]) - base
+            lj = int(c[j]) - base
+            stack.append((d + 1, mid, hi, mid + (i - lo) - li, mid + (j - lo) - lj))
+            stack.append((d + 1, lo, mid, lo + li, lo + lj))
+
+    def _iter_positions(self, region):
+        x_min, x_max = region[0] - self.eps, region[1] + self.eps
+        for d, i, j, is_full in self._iter_ranges(region):
+            p = self.pos[d][i:j]
+            if not is_full:
+                xs = self.xs[p]
+                p = p[(xs >= x_min) & (xs <= x_max)]
+            yield p
+
+    def query_positions(self, region):
+        """Pozycje wyników w porządku po x (indeksy tablic xs / ys)."""
+        full, partial = self._ranges(region)
+        chunks = [self.pos[d][i:j] for d, i, j in full]
+        if partial:
+            x_min, x_max = region[0] - self.eps, region[1] + self.eps
+            for d, i, j in partial:
+                p = self.pos[d][i:j]
+                xs = self.xs[p]
+                chunks.append(p[(xs >= x_min) & (xs <= x_max)])
+        if not chunks:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(chunks)
+
+    def query(self, region, return_indices=False):
+        pos = self.query_positions(region)
+        if return_indices:
+            return self.index[pos]
+        return list(zip(self.xs[pos].tolist(), self.ys[pos].tolist()))
+
+    def count(self, region):
+        full, partial = self._ranges(region)
+        total = sum(j - i for _, i, j in full)
+        x_min, x_max = region[0] - self.eps, region[1] + self.eps
+        for d, i, j in partial:
+            xs = self.xs[self.pos[d][i:j]]
+            total += int(((xs >= x_min) & (xs <= x_max)).sum())
+        return total
+
+    def iter_query(self, region, limit=None):
+        """Leniwa wersja query: punkty kolejnych wycinków kanonicznych."""
+        xs, ys = self.xs, self.ys
+        points = (pt for p in self._iter_positions(region)
+                  for pt in zip(xs[p].tolist(), ys[p].tolist()))
+        return islice(points, limit)
+
+    def any_in(self, region):
+        # Wycinek całkowity jest zawsze niepusty, więc zwykle wystarcza pierwszy
+        return any(len(p) for p in self._iter_positions(region))
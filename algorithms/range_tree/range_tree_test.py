@@ -0,0 +1,70 @@
+import random
+
+from algorithms.kd_tree.kd_class import KDTree
+from algorithms.range_tree.range_tree import RangeTree
+from test_data import TEST_DATA
+
+def run_range_tree_tests(leaf_size=8):
+    print(f"rozpoczynam test range tree (leaf_size={leaf_size})")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        expected = case["RES"]
+        cx, cy, w, h = case["R"]
+        region = (cx - w, cx + w, cy - h, cy + h)
+
+        rt = RangeTree(points, leaf_size=leaf_size)
+
+        result = sorted(rt.query(region))
+        by_index = sorted(points[j] for j in rt.query(region, return_indices=True))
+
+        lazy = sorted(rt.iter_query(region))
+        limited = list(rt.iter_query(region, limit=3))
+
+        if (result == expected and by_index == expected and rt.count(region) == len(expected)
+                and lazy == expected and len(limited) == min(3, len(expected))
+                and rt.any_in(region) == bool(expected)):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(result)}")
+
+    print(f"\nWynik Range Tree: {passed}/{total} zaliczonych.\n")
+
+def run_range_tree_eps_tests(leaf_size=8):
+    print(f"rozpoczynam test range tree vs KDTree - brzegi i eps (leaf_size={leaf_size})")
+    rng = random.Random(0)
+    # Siatka z duplikatami: wiele punktów dokładnie na brzegach zapytań
+    points = [(float(rng.randint(0, 20)), float(rng.randint(0, 20))) for _ in range(500)]
+    passed = 0
+    total = 40
+
+    kd = KDTree(points)
+    rt = RangeTree(points, leaf_size=leaf_size)
+    for t in range(total):
+        x0, x1 = sorted(rng.randint(-2, 22) for _ in range(2))
+        y0, y1 = sorted(rng.randint(-2, 22) for _ in range(2))
+        # Przesunięcie mniejsze od eps - punkt nadal powinien się załapać
+        shift = rng.choice((0.0, 5e-10, -5e-10))
+        region = (x0 + shift, x1 - shift, y0 + shift, y1 - shift)
+
+        expected = sorted(kd.query(region))
+        expected_ids = sorted(kd.query(region, return_indices=True).tolist())
+        if (sorted(rt.query(region)) == expected and rt.count(region) == len(expected)
+                and sorted(rt.query(region, return_indices=True).tolist()) == expected_ids
+                and sorted(rt.iter_query(region)) == expected and rt.any_in(region) == bool(expected)):
+            passed += 1
+        else:
+            print(f"Test {t+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {rt.count(region)}")
+
+    print(f"\nWynik Range Tree vs KDTree: {passed}/{total} zaliczonych.\n")
+
+if __name__ == "__main__":
+    run_range_tree_tests()
+    run_range_tree_tests(leaf_size=1)
+    run_range_tree_eps_tests()
+    run_range_tree_eps_tests(leaf_size=1)
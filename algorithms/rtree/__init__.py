@@ -0,0 +1 @@
+from .rtree import RTree
@@ -0,0 +1,205 @@
+import math
+from itertools import islice
+
+import numpy as np
+
+from algorithms.utils.arrays import as_points_array, ranges_to_indices
+
+
+def _str_order(boxes, fanout):
+    """Kolejność Sort-Tile-Recursive: pasy po środku x, w pasie po środku y."""
+    m = len(boxes)
+    n_groups = math.ceil(m / fanout)
+    n_slices = max(1, math.ceil(math.sqrt(n_groups)))
+    per_slice = n_slices * fanout
+
+    cx = (boxes[:, 0] + boxes[:, 1]) / 2
+    cy = (boxes[:, 2] + boxes[:, 3]) / 2
+    by_x = np.argsort(cx, kind="stable")
+    slice_of = np.empty(m, dtype=np.intp)
+    slice_of[by_x] = np.arange(m) // per_slice
+    return np.lexsort((cy, slice_of))
+
+
+def _group_boxes(boxes, fanout):
+    """Prostokąty ograniczające kolejnych grup po `fanout` elementów."""
+    starts = np.arange(0, len(boxes), fanout)
+    return np.column_stack((np.minimum.reduceat(boxes[:, 0], starts),
+                            np.maximum.reduceat(boxes[:, 1], starts),
+                            np.minimum.reduceat(boxes[:, 2], starts),
+                            np.maximum.reduceat(boxes[:, 3], starts))), starts
+
+
+class RTree:
+    """R-drzewo ładowane metodą STR, węzły w tablicach NumPy.
+
+    Obiekty to prostokąty (x_min, x_max, y_min, y_max) - punkty i odcinki są
+    zamieniane na swoje prostokąty ograniczające. Poziom `levels[i]` to
+    (boxes, lo, hi): prostokąty węzłów i zakres dzieci na poziomie niżej
+    (dla liści - zakres w `order`). Węzeł ma najwyżej `fanout` dzieci.
+    """
+
+    def __init__(self, boxes, fanout=16, eps=1e-9):
+        self.fanout = max(2, int(fanout))
+        self.eps = eps
+        self.segments = None
+
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        self.n = len(boxes)
+        self.boxes = boxes
+        self.levels = []
+        if self.n == 0:
+            self.order = np.empty(0, dtype=np.intp)
+            return
+
+        self.order = _str_order(boxes, self.fanout).astype(np.intp)
+        node_boxes, starts = _group_boxes(boxes[self.order], self.fanout)
+        lo = starts
+        hi = np.append(starts[1:], self.n)
+
+        # Kolejne poziomy: STR na prostokątach węzłów aż zostanie korzeń
+        while True:
+            if len(node_boxes) == 1:
+                self.levels.append((node_boxes, lo, hi))
+                break
+            perm = _str_order(node_boxes, self.fanout)
+            node_boxes, lo, hi = node_boxes[perm], lo[perm], hi[perm]
+            self.levels.append((node_boxes, lo, hi))
+            parent_boxes, starts = _group_boxes(node_boxes, self.fanout)
+            lo = starts
+            hi = np.append(starts[1:], len(node_boxes))
+            node_boxes = parent_boxes
+        self.levels.reverse()
+
+    @classmethod
+    def from_points(cls, points, fanout=16, eps=1e-9):
+        pts = as_points_array(points)
+        return cls(np.column_stack((pts[:, 0], pts[:, 0], pts[:, 1], pts[:, 1])), fanout, eps)
+
+    @classmethod
+    def from_segments(cls, segments, fanout=16, eps=1e-9):
+        """Odcinki w formacie LineSegment: [((x1, y1), (x2, y2)), ...]."""
+        seg = np.asarray(segments, dtype=np.float64).reshape(-1, 2, 2)
+        xs, ys = seg[:, :, 0], seg[:, :, 1]
+        tree = cls(np.column_stack((xs.min(axis=1), xs.max(axis=1), ys.min(axis=1), ys.max(axis=1))),
+                   fanout, eps)
+        tree.segments = seg
+        return tree
+
+    @classmethod
+    def from_polygons(cls, polygons, fanout=16, eps=1e-9):
+        """Wielokąty jako listy wierzchołków; indeksowane są ich prostokąty ograniczające."""
+        boxes = []
+        for poly in polygons:
+            v = np.asarray(poly, dtype=np.float64).reshape(-1, 2)
+            boxes.append((v[:, 0].min(), v[:, 0].max(), v[:, 1].min(), v[:, 1].max()))
+        return cls(boxes, fanout, eps)
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def height(self):
+        return len(self.levels)
+
+    @property
+    def nbytes(self):
+        arrays = [self.boxes, self.order] + [a for level in self.levels for a in level]
+        return sum(a.nbytes for a in arrays)
+
+    @staticmethod
+    def _intersects(boxes, x_min, x_max, y_min, y_max):
+        return ((boxes[:, 0] <= x_max) & (boxes[:, 1] >= x_min) &
+                (boxes[:, 2] <= y_max) & (boxes[:, 3] >= y_min))
+
+    @staticmethod
+    def _within(boxes, x_min, x_max, y_min, y_max):
+        return ((boxes[:, 0] >= x_min) & (boxes[:, 1] <= x_max) &
+                (boxes[:, 2] >= y_min) & (boxes[:, 3] <= y_max))
+
+    @staticmethod
+    def _contains(boxes, x_min, x_max, y_min, y_max):
+        return ((boxes[:, 0] <= x_min) & (boxes[:, 1] >= x_max) &
+                (boxes[:, 2] <= y_min) & (boxes[:, 3] >= y_max))
+
+    def _segments_hit(self, ids, x_min, x_max, y_min, y_max):
+        # Prostokąty ograniczające już się przecinają; odcinek omija prostokąt
+        # tylko wtedy, gdy wszystkie cztery rogi leżą ściśle po jednej stronie prostej
+        seg = self.segments[ids]
+        x1, y1 = seg[:, 0, 0], seg[:, 0, 1]
+        dx, dy = seg[:, 1, 0] - x1, seg[:, 1, 1] - y1
+        side = np.stack([dx * (cy - y1) - dy * (cx - x1)
+                         for cx, cy in ((x_min, y_min), (x_min, y_max), (x_max, y_min), (x_max, y_max))])
+        return ~((side > 0).all(axis=0) | (side < 0).all(axis=0))
+
+    def query(self, region, mode="intersects"):
+        """Indeksy obiektów względem prostokąta (x_min, x_max, y_min, y_max).
+
+        mode: "intersects" - obiekt ma część wspólną z prostokątem (odcinki
+        sprawdzane dokładnie), "within" - obiekt leży w prostokącie,
+        "contains" - obiekt zawiera prostokąt. Brzegi poszerzone o eps jak w KDTree.
+        """
+        if self.n == 0:
+            return np.empty(0, dtype=np.intp)
+        prune, q = self._prune_for(region, mode)
+
+        frontier = np.zeros(1, dtype=np.intp)
+        for boxes, lo, hi in self.levels:
+            hit = frontier[prune(boxes[frontier], *q)]
+            frontier = ranges_to_indices(lo[hit], hi[hit])
+        return self._filter(self.order[frontier], mode, q)
+
+    def _prune_for(self, region, mode):
+        EPS = self.eps
+        x_min, x_max, y_min, y_max = region
+        if mode == "intersects" or mode == "within":
+            # Obiekt leżący w prostokącie też go przecina, więc przycinanie jest to samo
+            return self._intersects, (x_min - EPS, x_max + EPS, y_min - EPS, y_max + EPS)
+        if mode == "contains":
+            # Węzeł zawiera prostokąty swoich dzieci, więc też każdy zawarty w nich obszar;
+            # eps działa tu w drugą stronę - zapytanie jest zwężane
+            return self._contains, (x_min + EPS, x_max - EPS, y_min + EPS, y_max - EPS)
+        raise ValueError(f"Nieznany tryb zapytania: {mode}")
+
+    def _filter(self, ids, mode, q):
+        boxes = self.boxes[ids]
+        if mode == "within":
+            return ids[self._within(boxes, *q)]
+        if mode == "contains":
+            return ids[self._contains(boxes, *q)]
+        ids = ids[self._intersects(boxes, *q)]
+        if self.segments is not None and len(ids):
+            ids = ids[self._segments_hit(ids, *q)]
+        return ids
+
+    def _iter_ids(self, region, mode):
+        # Przejście w głąb: wyniki kolejnych liści, bez budowania całego frontu
+        if self.n == 0:
+            return
+        prune, q = self._prune_for(region, mode)
+        levels = self.levels
+        if not prune(levels[0][0], *q)[0]:
+            return
+        last = len(levels) - 1
+        stack = [(0, 0)]
+        while stack:
+            d, v = stack.pop()
+            _, lo, hi = levels[d]
+            a, b = int(lo[v]), int(hi[v])
+            if d == last:
+                yield from self._filter(self.order[a:b], mode, q).tolist()
+                continue
+            hit = np.flatnonzero(prune(levels[d + 1][0][a:b], *q)) + a
+            stack.extend((d + 1, c) for c in reversed(hit.tolist()))
+
+    def iter_query(self, region, mode="intersects", limit=None):
+        """Leniwa wersja query: indeksy obiektów w miarę przechodzenia drzewa."""
+        return islice(self._iter_ids(region, mode), limit)
+
+    def any_in(self, region, mode="intersects"):
+        for _ in self._iter_ids(region, mode):
+            return True
+        return False
+
+    def count(self, region, mode="intersects"):
+        return len(self.query(region, mode))
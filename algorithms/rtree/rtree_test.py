@@ -0,0 +1,100 @@
+import random
+
+from algorithms.kd_tree.kd_class import KDTree
+from algorithms.rtree.rtree import RTree
+from test_data import TEST_DATA
+
+def run_rtree_points_tests(fanout=4):
+    print(f"rozpoczynam test rtree - punkty (fanout={fanout})")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        expected = case["RES"]
+        cx, cy, w, h = case["R"]
+        region = (cx - w, cx + w, cy - h, cy + h)
+
+        tree = RTree.from_points(points, fanout=fanout)
+        ids = tree.query(region)
+        kd_ids = KDTree(points).query(region, return_indices=True)
+
+        if (sorted(points[j] for j in ids) == expected and sorted(ids.tolist()) == sorted(kd_ids.tolist())
+                and sorted(tree.query(region, mode="within").tolist()) == sorted(ids.tolist())
+                and sorted(tree.iter_query(region)) == sorted(ids.tolist())
+                and len(list(tree.iter_query(region, limit=3))) == min(3, len(ids))
+                and tree.any_in(region) == bool(len(ids))):
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(expected)}, Otrzymano: {len(ids)}")
+
+    print(f"\nWynik RTree (punkty): {passed}/{total} zaliczonych.\n")
+
+def _segment_hits_rect(seg, region):
+    # Wyrocznia: obcinanie Lianga-Barsky'ego
+    (x1, y1), (x2, y2) = seg
+    x_min, x_max, y_min, y_max = region
+    dx, dy = x2 - x1, y2 - y1
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x1 - x_min), (dx, x_max - x1), (-dy, y1 - y_min), (dy, y_max - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+        elif p < 0:
+            t0 = max(t0, q / p)
+        else:
+            t1 = min(t1, q / p)
+    return t0 <= t1
+
+def run_rtree_shapes_tests(fanout=4):
+    print(f"rozpoczynam test rtree - prostokąty i odcinki (fanout={fanout})")
+    rng = random.Random(0)
+    boxes = []
+    for _ in range(300):
+        x, y = rng.uniform(0, 100), rng.uniform(0, 100)
+        boxes.append((x, x + rng.uniform(0, 15), y, y + rng.uniform(0, 15)))
+    segments = []
+    for _ in range(300):
+        x, y = rng.uniform(0, 100), rng.uniform(0, 100)
+        segments.append(((x, y), (x + rng.uniform(-20, 20), y + rng.uniform(-20, 20))))
+
+    box_tree = RTree(boxes, fanout=fanout)
+    seg_tree = RTree.from_segments(segments, fanout=fanout)
+    passed = 0
+    total = 30
+
+    for t in range(total):
+        x0, y0 = rng.uniform(0, 90), rng.uniform(0, 90)
+        region = (x0, x0 + rng.uniform(0.5, 20), y0, y0 + rng.uniform(0.5, 20))
+        x_min, x_max, y_min, y_max = region
+
+        inter = [j for j, b in enumerate(boxes)
+                 if b[0] <= x_max and b[1] >= x_min and b[2] <= y_max and b[3] >= y_min]
+        within = [j for j, b in enumerate(boxes)
+                  if b[0] >= x_min and b[1] <= x_max and b[2] >= y_min and b[3] <= y_max]
+        contains = [j for j, b in enumerate(boxes)
+                    if b[0] <= x_min and b[1] >= x_max and b[2] <= y_min and b[3] >= y_max]
+        seg_hits = [j for j, s in enumerate(segments) if _segment_hits_rect(s, region)]
+
+        if (sorted(box_tree.query(region).tolist()) == inter
+                and sorted(box_tree.query(region, mode="within").tolist()) == within
+                and sorted(box_tree.query(region, mode="contains").tolist()) == contains
+                and sorted(seg_tree.query(region).tolist()) == seg_hits
+                and box_tree.count(region) == len(inter)
+                and sorted(box_tree.iter_query(region, mode="contains")) == contains
+                and sorted(seg_tree.iter_query(region)) == seg_hits
+                and seg_tree.any_in(region) == bool(seg_hits)):
+            passed += 1
+        else:
+            print(f"Test {t+1}/{total}: BŁĄD!")
+            print(f"   Oczekiwano: {len(inter)}, Otrzymano: {box_tree.count(region)}")
+
+    print(f"\nWynik RTree (prostokąty i odcinki): {passed}/{total} zaliczonych.\n")
+
+if __name__ == "__main__":
+    run_rtree_points_tests()
+    run_rtree_points_tests(fanout=16)
+    run_rtree_shapes_tests()
+    run_rtree_shapes_tests(fanout=16)
@@ -0,0 +1,21 @@
+import numpy as np
+
+
+def as_points_array(points_list):
+    """Punkty (Point, krotki (x, y) albo tablica) jako tablica float64 o kształcie (n, 2)."""
+    if isinstance(points_list, np.ndarray):
+        return points_list.astype(np.float64).reshape(-1, 2)
+    # Import w funkcji: pakiet quadtree sam importuje ten moduł
+    from algorithms.quadtree.quadtree import Point
+    return np.asarray([(p.x, p.y) if isinstance(p, Point) else (p[0], p[1])
+                       for p in points_list], dtype=np.float64).reshape(-1, 2)
+
+
+def ranges_to_indices(starts, ends):
+    """Sklejenie zakresów [starts[k], ends[k]) w jedną tablicę indeksów."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.intp)
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+    return np.arange(total, dtype=np.intp) + offsets
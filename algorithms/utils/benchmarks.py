@@ -0,0 +1,693 @@
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from generators import gen_uniform, gen_gauss, gen_line_yx, gen_envelope, gen_grid, gen_ring
+from algorithms.kd_tree.kd_class import KDTree
+from algorithms.kd_tree.flat_kd_tree import FlatKDTree
+from algorithms.kd_tree.dynamic_kd_tree import DynamicKDTree
+from algorithms.quadtree.quadtree import Point, Rectangle, build_quadtree
+from algorithms.quadtree.linear_quadtree import LinearQuadTree
+from algorithms.quadtree.compressed_quadtree import CompressedQuadTree
+from algorithms.grid.grid_index import GridIndex
+from algorithms.range_tree.range_tree import RangeTree
+from algorithms.rtree.rtree import RTree
+from algorithms.brute_force.brute_force import BruteForceIndex
+from algorithms.utils.spatial_index import measure_crossover
+from algorithms.utils.build_tree import TreeCache, get_points_in_area
+
+DATASETS = {
+    "Uniform": gen_uniform,
+    "Gauss": gen_gauss,
+    "Line_YX": gen_line_yx,
+    "Envelope": gen_envelope,
+    "Grid": gen_grid,
+    "Ring": gen_ring,
+}
+
+QUERY_REGION = (-25, 25, -25, 25)
+
+
+def time_ms(fn, repeat=1):
+    """Najlepszy czas (ms) z `repeat` wywołań oraz wynik ostatniego."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, (time.perf_counter() - t0) * 1000)
+    return best, result
+
+
+def random_regions(points, m, rng, frac=0.25):
+    """`m` prostokątów (x_min, x_max, y_min, y_max) o boku `frac` rozpiętości danych."""
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    x_lo, x_hi, y_lo, y_hi = min(xs), max(xs), min(ys), max(ys)
+    w = (x_hi - x_lo) * frac
+    h = (y_hi - y_lo) * frac
+    regions = []
+    for _ in range(m):
+        x0 = rng.uniform(x_lo, x_hi - w)
+        y0 = rng.uniform(y_lo, y_hi - h)
+        regions.append((x0, x0 + w, y0, y0 + h))
+    return regions
+
+
+def traced_bytes(fn):
+    """Pamięć (B) zaalokowana przez `fn` i wciąż żywa po jej zakończeniu."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def bench_flat_kdtree(sizes=(10_000, 100_000, 1_000_000), leaf_size=8, repeat=5):
+    """KDTree vs FlatKDTree: pamięć na punkt, czas budowy i zapytania."""
+    rows = []
+    for n in sizes:
+        points = gen_uniform(n)
+        for name, factory in (("KDTree", lambda: KDTree(points)),
+                              ("FlatKDTree", lambda: FlatKDTree(points, leaf_size=leaf_size))):
+            mem, _ = traced_bytes(factory)
+            build_ms, tree = time_ms(factory)
+            query_ms, found = time_ms(lambda: tree.query(QUERY_REGION), repeat)
+            rows.append({
+                "Engine": name,
+                "N": n,
+                "Found": len(found),
+                "Bytes_per_point": mem / n,
+                "Build_ms": build_ms,
+                "Query_us": query_ms * 1000,
+            })
+    return pd.DataFrame(rows)
+
+
+def bench_kdtree_build(sizes=(10_000, 100_000), repeat=3):
+    """Budowa KDTree: sortowanie + filtrowanie zbiorami vs partycjonowanie permutacji."""
+    rows = []
+    for dataset, gen in DATASETS.items():
+        for n in sizes:
+            points = gen(n)
+            sort_ms, _ = time_ms(lambda: KDTree(points, build="sort"), repeat)
+            part_ms, _ = time_ms(lambda: KDTree(points, build="partition"), repeat)
+            rows.append({
+                "Dataset": dataset,
+                "N": n,
+                "Build_sort_ms": sort_ms,
+                "Build_partition_ms": part_ms,
+                "Speedup": sort_ms / part_ms,
+            })
+    return pd.DataFrame(rows)
+
+
+def bench_kdtree_leaf_size(n=100_000, leaf_sizes=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+                           datasets=("Uniform", "Gauss"), n_queries=50, repeat=3):
+    """Przegląd leaf_size KDTree: czas budowy i średni czas zapytania."""
+    rng = random.Random(0)
+    rows = []
+    for dataset in datasets:
+        points = DATASETS[dataset](n)
+        regions = random_regions(points, n_queries, rng)
+        for leaf_size in leaf_sizes:
+            build_ms, tree = time_ms(lambda: KDTree(points, leaf_size=leaf_size))
+            query_ms, _ = time_ms(lambda: [tree.query(r) for r in regions], repeat)
+            rows.append({
+                "Dataset": dataset,
+                "N": n,
+                "Leaf_size": leaf_size,
+                "Build_ms": build_ms,
+                "Query_us": query_ms * 1000 / n_queries,
+            })
+    df = pd.DataFrame(rows)
+    best = df.loc[df.groupby("Dataset")["Query_us"].idxmin(), ["Dataset", "Leaf_size"]]
+    print("Najlepszy leaf_size:", dict(zip(best["Dataset"], best["Leaf_size"])))
+    return df
+
+
+def region_to_rect(region):
+    x_min, x_max, y_min, y_max = region
+    return Rectangle((x_min + x_max) / 2, (y_min + y_max) / 2,
+                     (x_max - x_min) / 2, (y_max - y_min) / 2)
+
+
+def bench_count(n=20_000, repeat=20):
+    """query() + len() vs count() na obu drzewach."""
+    rect = region_to_rect(QUERY_REGION)
+    rows = []
+    for dataset, gen in DATASETS.items():
+        points = gen(n)
+        kd = KDTree(points)
+        qt = build_quadtree(points)
+        kd_query_ms, found = time_ms(lambda: len(kd.query(QUERY_REGION)), repeat)
+        kd_count_ms, _ = time_ms(lambda: kd.count(QUERY_REGION), repeat)
+        qt_query_ms, _ = time_ms(lambda: len(qt.query(rect, [])), repeat)
+        qt_count_ms, _ = time_ms(lambda: qt.count(rect), repeat)
+        rows.append({
+            "Dataset": dataset,
+            "N": n,
+            "Found": found,
+            "Query_KD_us": kd_query_ms * 1000,
+            "Count_KD_us": kd_count_ms * 1000,
+            "Query_QT_us": qt_query_ms * 1000,
+            "Count_QT_us": qt_count_ms * 1000,
+        })
+    return pd.DataFrame(rows)
+
+
+def bench_query_many(n=20_000, ms=(10, 100, 1_000, 10_000, 100_000), leaf_size=8, frac=0.05):
+    """KDTree.query_many vs m sekwencyjnych wywołań KDTree.query."""
+    rng = random.Random(0)
+    points = gen_uniform(n)
+    tree = KDTree(points, leaf_size=leaf_size)
+    rows = []
+    for m in ms:
+        regions = random_regions(points, m, rng, frac)
+        loop_ms, found = time_ms(lambda: sum(len(tree.query(r)) for r in regions))
+        many_ms, (offsets, _) = time_ms(lambda: tree.query_many(regions))
+        rows.append({
+            "N": n,
+            "M": m,
+            "Found": found,
+            "Loop_ms": loop_ms,
+            "Query_many_ms": many_ms,
+            "Speedup": loop_ms / many_ms,
+            "Same_count": found == int(offsets[-1]),
+        })
+    return pd.DataFrame(rows)
+
+
+def brute_force_knn(coords, queries, k):
+    """Wyrocznia kNN w NumPy: pełna macierz odległości dla każdego zapytania."""
+    k = min(k, len(coords))
+    distances = np.empty((len(queries), k))
+    for q, (x, y) in enumerate(queries):
+        d = np.hypot(coords[:, 0] - x, coords[:, 1] - y)
+        nearest = np.argpartition(d, k - 1)[:k]
+        distances[q] = np.sort(d[nearest])
+    return distances
+
+
+def bench_nearest(n=100_000, m=1_000, k=10, leaf_size=8):
+    """KDTree.nearest_many vs brute force NumPy, z walidacją odległości."""
+    rng = np.random.default_rng(0)
+    rows = []
+    for dataset, gen in DATASETS.items():
+        points = gen(n)
+        coords = np.asarray(points, dtype=np.float64)
+        lo, hi = coords.min(axis=0), coords.max(axis=0)
+        queries = rng.uniform(lo, hi, size=(m, 2))
+        tree = KDTree(points, leaf_size=leaf_size)
+        kd_ms, (kd_dist, _) = time_ms(lambda: tree.nearest_many(queries, k))
+        bf_ms, bf_dist = time_ms(lambda: brute_force_knn(coords, queries, k))
+        rows.append({
+            "Dataset": dataset,
+            "N": n,
+            "M": m,
+            "K": k,
+            "KNN_KD_us": kd_ms * 1000 / m,
+            "KNN_brute_us": bf_ms * 1000 / m,
+            "Match": bool(np.allclose(kd_dist, bf_dist)),
+        })
+    return pd.DataFrame(rows)
+
+
+def bench_quadtree_nearest(n=100_000, m=1_000, k=10, leaf_size=8):
+    """QuadTree.nearest_many vs KDTree.nearest_many na wszystkich rozkładach."""
+    rng = np.random.default_rng(0)
+    rows = []
+    for dataset, gen in DATASETS.items():
+        points = gen(n)
+        coords = np.asarray(points, dtype=np.float64)
+        lo, hi = coords.min(axis=0), coords.max(axis=0)
+        queries = rng.uniform(lo, hi, size=(m, 2))
+        kd = KDTree(points, leaf_size=leaf_size)
+        qt = build_quadtree(points)
+        kd_ms, (kd_dist, _) = time_ms(lambda: kd.nearest_many(queries, k))
+        qt_ms, (qt_dist, _) = time_ms(lambda: qt.nearest_many(queries, k))
+        rows.append({
+            "Dataset": dataset,
+            "N": n,
+            "M": m,
+            "K": k,
+            "KNN_KD_us": kd_ms * 1000 / m,
+            "KNN_QT_us": qt_ms * 1000 / m,
+            "Match": bool(np.allclose(kd_dist, qt_dist)),
+        })
+    return pd.DataFrame(rows)
+
+
+def bench_pairs_within(sizes=(100_000, 1_000_000), d=0.1):
+    """QuadTree.pairs_within vs jedno zapytanie prostokątne na punkt."""
+    rows = []
+    for n in sizes:
+        points = gen_uniform(n)
+        coords = np.asarray(points, dtype=np.float64)
+        qt = build_quadtree(points)
+
+        def per_point():
+            firsts, seconds = [], []
+            for i, (x, y) in enumerate(points):
+                ids = qt.query(Rectangle(x, y, d, d), return_indices=True)
+                ids = ids[ids > i]
+                close = ((coords[ids] - coords[i]) ** 2).sum(axis=1) <= d * d
+                firsts.append(np.full(int(close.sum()), i))
+                seconds.append(ids[close])
+            return np.column_stack((np.concatenate(firsts), np.concatenate(seconds)))
+
+        dual_ms, pairs = time_ms(lambda: qt.pairs_within(d))
+        per_ms, expected = time_ms(per_point)
+        rows.append({
+            "N": n,
+            "D": d,
+            "Pairs": len(pairs),
+            "Dual_tree_ms": dual_ms,
+            "Per_point_ms": per_ms,
+            "Match": (set(map(tuple, np.sort(pairs, axis=1).tolist()))
+                      == set(map(tuple, expected.tolist()))),
+        })
+    return pd.DataFrame(rows)
+
+
+def bench_radius(n=20_000, r=25, repeat=20):
+    """query_radius vs kwadrat opisany przez query() + filtrowanie w Pythonie."""
+    square = (-r, r, -r, r)
+    rows = []
+    for dataset, gen in DATASETS.items():
+        points = gen(n)
+        kd = KDTree(points)
+        qt = build_quadtree(points)
+
+        def kd_square():
+            return [p for p in kd.query(square) if p[0] ** 2 + p[1] ** 2 <= r * r]
+
+        def qt_square():
+            found = qt.query(region_to_rect(square), [])
+            return [p for p in found if p.x ** 2 + p.y ** 2 <= r * r]
+
+        kd_sq_ms, found = time_ms(kd_square, repeat)
+        kd_ms, _ = time_ms(lambda: kd.query_radius((0, 0), r), repeat)
+        qt_sq_ms, _ = time_ms(qt_square, repeat)
+        qt_ms, _ = time_ms(lambda: qt.query_radius((0, 0), r, []), repeat)
+        rows.append({
+            "Dataset": dataset,
+            "N": n,
+            "Found": len(found),
+            "Square_KD_us": kd_sq_ms * 1000,
+            "Radius_KD_us": kd_ms * 1000,
+            "Square_QT_us": qt_sq_ms * 1000,
+            "Radius_QT_us": qt_ms * 1000,
+        })
+    return pd.DataFrame(rows)
+
+
+def bench_dynamic_kdtree(n_initial=50_000, n_ops=20_000, insert_ratios=(0.9, 0.5, 0.1),
+                         delete_ratios=(0.0, 0.3), frac=0.05):
+    """Przepustowość DynamicKDTree dla mieszanych strumieni insert/delete/query.
+
+    Usuwane są losowe żywe punkty, więc przy delete_ratio > 0 poziomy zbierają
+    martwe punkty aż do przebudowy (rebuild_ratio) - mierzy to koszt zapytań
+    z pominięciem martwych.
+    """
+    rng = random.Random(0)
+    initial = gen_uniform(n_initial)
+    rows = []
+    for delete_ratio in delete_ratios:
+        for ratio in insert_ratios:
+            if ratio + delete_ratio > 1:
+                continue
+            tree = DynamicKDTree(initial)
+            new_points = gen_uniform(n_ops)
+            regions = random_regions(initial, n_ops, rng, frac)
+            draws = [rng.random() for _ in range(n_ops)]
+            live = list(initial)
+            rng.shuffle(live)
+
+            def workload():
+                for u, p, r in zip(draws, new_points, regions):
+                    if u < ratio:
+                        tree.insert(p)
+                        live.append(p)
+                    elif u < ratio + delete_ratio and live:
+                        tree.delete(live.pop())
+                    else:
+                        tree.query(r)
+
+            ms, _ = time_ms(workload)
+            rows.append({
+                "N_initial": n_initial,
+                "Ops": n_ops,
+                "Insert_ratio": ratio,
+                "Delete_ratio": delete_ratio,
+                "Total_ms": ms,
+                "Ops_per_s": n_ops / (ms / 1000),
+                "Levels": sum(level is not None for level in tree.levels),
+                "Dead": tree.n_dead,
+            })
+
+    rebuild_ms, _ = time_ms(lambda: KDTree(initial, leaf_size=8))
+    print(f"Przebudowa statycznego KDTree ({n_initial} pkt): {rebuild_ms:.1f} ms na jeden insert")
+    return pd.DataFrame(rows)
+
+
+def bench_quadtree_build(sizes=(20_000, 100_000), repeat=3):
+    """Budowa QuadTree: pojedyncze insert() vs ładowanie całymi poziomami."""
+    rows = []
+    for dataset, gen in DATASETS.items():
+        for n in sizes:
+            points = gen(n)
+            insert_ms, _ = time_ms(lambda: build_quadtree(points, build="insert"), repeat)
+            bulk_ms, _ = time_ms(lambda: build_quadtree(points, build="bulk"), repeat)
+            rows.append({
+                "Dataset": dataset,
+                "N": n,
+                "Build_insert_ms": insert_ms,
+                "Build_bulk_ms": bulk_ms,
+                "Speedup": insert_ms / bulk_ms,
+            })
+    return pd.DataFrame(rows)
+
+
+def bench_linear_quadtree(sizes=(100_000, 1_000_000), repeat=5):
+    """QuadTree (obiekty) vs LinearQuadTree (kody Mortona): pamięć i czas zapytania."""
+    rect = region_to_rect(QUERY_REGION)
+    rows = []
+    for n in sizes:
+        points = gen_uniform(n)
+        for name, factory in (("QuadTree", lambda: build_quadtree(points)),
+                              ("LinearQuadTree", lambda: LinearQuadTree(points))):
+            mem, tree = traced_bytes(factory)
+            build_ms, _ = time_ms(factory)
+            query_ms, found = time_ms(lambda: tree.query(rect), repeat)
+            rows.append({
+                "Engine": name,
+                "N": n,
+                "Found": len(found),
+                "Bytes_per_point": mem / n,
+                "Build_ms": build_ms,
+                "Query_us": query_ms * 1000,
+            })
+            del tree
+    return pd.DataFrame(rows)
+
+
+def quadtree_shape(node):
+    """(liczba węzłów, wysokość) drzewa QuadTree."""
+    n_nodes, height = 0, 0
+    stack = [(node, 0)]
+    while stack:
+        node, depth = stack.pop()
+        n_nodes += 1
+        height = max(height, depth)
+        if node.divided:
+            stack.extend((c, depth + 1) for c in (node.northeast, node.northwest,
+                                                  node.southeast, node.southwest))
+    return n_nodes, height
+
+
+def bench_compressed_quadtree(n=100_000, repeat=10):
+    """QuadTree vs CompressedQuadTree na danych skupionych: wysokość, węzły, czasy."""
+    rect = region_to_rect(QUERY_REGION)
+    rows = []
+    for dataset in ("Gauss", "Line_YX", "Envelope"):
+        points = DATASETS[dataset](n)
+        # Wariant z duplikatami: współrzędne zaokrąglone do siatki 0.1
+        dup = [(round(x, 1), round(y, 1)) for x, y in points]
+        for variant, data in ((dataset, points), (dataset + "_dup", dup)):
+            build_ms, qt = time_ms(lambda: build_quadtree(data))
+            c_build_ms, cqt = time_ms(lambda: CompressedQuadTree(data))
+            query_ms, found = time_ms(lambda: qt.query(rect), repeat)
+            c_query_ms, c_found = time_ms(lambda: cqt.query(rect), repeat)
+            n_nodes, height = quadtree_shape(qt)
+            assert len(found) == len(c_found)
+            rows.append({
+                "Dataset": variant,
+                "N": n,
+                "Distinct": len(cqt.xs),
+                "QT_nodes": n_nodes,
+                "QT_height": height,
+                "CQT_nodes": cqt.n_nodes,
+                "CQT_height": cqt.height,
+                "QT_build_ms": build_ms,
+                "CQT_build_ms": c_build_ms,
+                "QT_query_us": query_ms * 1000,
+                "CQT_query_us": c_query_ms * 1000,
+            })
+    return pd.DataFrame(rows)
+
+
+def bench_quadtree_memory(n=100_000):
+    """Raport tracemalloc: bajty na punkt dla obiektów Point, węzłów QuadTree i LinearQuadTree."""
+    rows = []
+    for dataset in ("Uniform", "Gauss", "Line_YX"):
+        points = DATASETS[dataset](n)
+        point_mem, point_objs = traced_bytes(lambda: [Point(x, y) for x, y in points])
+        tree_mem, _ = traced_bytes(lambda: build_quadtree(point_objs))
+        linear_mem, _ = traced_bytes(lambda: LinearQuadTree(points))
+        rows.append({
+            "Dataset": dataset,
+            "N": n,
+            "Point_objects_B": point_mem / n,
+            "QuadTree_nodes_B": tree_mem / n,
+            "QuadTree_total_B": (point_mem + tree_mem) / n,
+            "LinearQuadTree_B": linear_mem / n,
+        })
+    return pd.DataFrame(rows)
+
+
+def bench_quadtree_move(n=1_000_000, frac=0.1, ticks=3, step=1.0):
+    """Symulacja ruchu: co tik przesuwane jest `frac` punktów (move) vs pełna przebudowa."""
+    rng = np.random.default_rng(0)
+    rows = []
+    for dataset in ("Uniform", "Gauss"):
+        points = DATASETS[dataset](n)
+        point_objs = [Point(x, y) for x, y in points]
+        qt = build_quadtree(point_objs)
+        m = int(n * frac)
+        for tick in range(ticks):
+            chosen = rng.choice(n, m, replace=False).tolist()
+            deltas = rng.uniform(-step, step, (m, 2)).tolist()
+
+            def run_moves():
+                moved = 0
+                for i, (dx, dy) in zip(chosen, deltas):
+                    p = point_objs[i]
+                    moved += qt.move(p, p.x + dx, p.y + dy)
+                return moved
+
+            move_ms, moved = time_ms(run_moves)
+            rebuild_ms, _ = time_ms(lambda: build_quadtree(point_objs))
+            rows.append({
+                "Dataset": dataset,
+                "N": n,
+                "Tick": tick,
+                "Moved": moved,
+                "Move_ms": move_ms,
+                "Rebuild_ms": rebuild_ms,
+                "Tree_size": qt.size,
+            })
+    return pd.DataFrame(rows)
+
+
+def bench_grid_index(sizes=(20_000, 100_000), repeat=20):
+    """GridIndex vs KDTree vs QuadTree: czas budowy i zapytania na wszystkich rozkładach."""
+    rect = region_to_rect(QUERY_REGION)
+    rows = []
+    for n in sizes:
+        for dataset, gen in DATASETS.items():
+            points = gen(n)
+            engines = (("KD", lambda: KDTree(points), lambda t: t.query(QUERY_REGION)),
+                       ("QT", lambda: build_quadtree(points), lambda t: t.query(rect)),
+                       ("Grid", lambda: GridIndex(points), lambda t: t.query(rect)))
+            row = {"Dataset": dataset, "N": n}
+            for name, build, query in engines:
+                build_ms, tree = time_ms(build)
+                query_ms, found = time_ms(lambda: query(tree), repeat)
+                row[f"Build_{name}_ms"] = build_ms
+                row[f"Query_{name}_us"] = query_ms * 1000
+                row["Found"] = len(found)
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def bench_range_tree(sizes=(10_000, 100_000, 1_000_000), m=200, frac=0.02, leaf_size=8):
+    """RangeTree vs KDTree: pamięć, budowa i średni czas małych zapytań (Uniform)."""
+    rng = random.Random(0)
+    rows = []
+    for n in sizes:
+        points = gen_uniform(n)
+        regions = random_regions(points, m, rng, frac)
+        for name, factory in (("KDTree", lambda: KDTree(points, leaf_size=leaf_size)),
+                              ("RangeTree", lambda: RangeTree(points, leaf_size=leaf_size))):
+            mem, tree = traced_bytes(factory)
+            build_ms, _ = time_ms(factory)
+            query_ms, found = time_ms(lambda: [tree.query(r, return_indices=True) for r in regions])
+            rows.append({
+                "Engine": name,
+                "N": n,
+                "Found_avg": sum(len(f) for f in found) / m,
+                "Bytes_per_point": mem / n,
+                "Build_ms": build_ms,
+                "Query_us": query_ms * 1000 / m,
+            })
+            del tree
+    return pd.DataFrame(rows)
+
+
+def bench_rtree(sizes=(10_000, 100_000), m=200, frac=0.02, fanout=16):
+    """RTree (STR) na punktach vs KDTree oraz na odcinkach i prostokątach."""
+    rng = random.Random(0)
+    np_rng = np.random.default_rng(0)
+    rows = []
+    for n in sizes:
+        points = gen_uniform(n)
+        regions = random_regions(points, m, rng, frac)
+        coords = np.asarray(points, dtype=np.float64)
+        # Odcinki i prostokąty zaczepione w punktach, długość do 5 jednostek
+        ends = coords + np_rng.uniform(-5, 5, size=coords.shape)
+        segments = np.stack((coords, ends), axis=1)
+        boxes = np.column_stack((np.minimum(coords[:, 0], ends[:, 0]), np.maximum(coords[:, 0], ends[:, 0]),
+                                 np.minimum(coords[:, 1], ends[:, 1]), np.maximum(coords[:, 1], ends[:, 1])))
+
+        kd = KDTree(points, leaf_size=8)
+        cases = (("KDTree_points", lambda: KDTree(points, leaf_size=8),
+                  lambda t, r: t.query(r, return_indices=True)),
+                 ("RTree_points", lambda: RTree.from_points(coords, fanout),
+                  lambda t, r: t.query(r)),
+                 ("RTree_segments", lambda: RTree.from_segments(segments, fanout),
+                  lambda t, r: t.query(r)),
+                 ("RTree_boxes_within", lambda: RTree(boxes, fanout),
+                  lambda t, r: t.query(r, mode="within")))
+        for name, build, query in cases:
+            build_ms, tree = time_ms(build)
+            query_ms, found = time_ms(lambda: [query(tree, r) for r in regions])
+            rows.append({
+                "Engine": name,
+                "N": n,
+                "Found_avg": sum(len(f) for f in found) / m,
+                "Build_ms": build_ms,
+                "Query_us": query_ms * 1000 / m,
+            })
+        rt = RTree.from_points(coords, fanout)
+        assert all(np.array_equal(np.sort(rt.query(r)), np.sort(kd.query(r, return_indices=True)))
+                   for r in regions)
+    return pd.DataFrame(rows)
+
+
+def bench_brute_force(sizes=(1_000, 10_000, 100_000), fracs=(0.05, 0.5, 1.0), repeat=10):
+    """BruteForceIndex jako punkt odniesienia: budowa + zapytanie i samo zapytanie.
+
+    Ostatni wiersz to próg n zmierzony na tej maszynie (measure_crossover).
+    """
+    rows = []
+    for n in sizes:
+        points = gen_uniform(n)
+        engines = (("Brute", lambda: BruteForceIndex(points)),
+                   ("KD", lambda: KDTree(points)),
+                   ("QT", lambda: build_quadtree(points)),
+                   ("Grid", lambda: GridIndex(points)))
+        built = {}
+        build_times = {}
+        for name, factory in engines:
+            build_times[name], built[name] = time_ms(factory)
+        for frac in fracs:
+            side = 100 * frac
+            rect = Rectangle(0, 0, side, side)
+            region = (-side, side, -side, side)
+            row = {"N": n, "Rect_frac": frac}
+            for name, _ in engines:
+                tree = built[name]
+                if name == "KD":
+                    query_ms, found = time_ms(lambda: tree.query(region, return_indices=True), repeat)
+                else:
+                    query_ms, found = time_ms(lambda: tree.query(rect, return_indices=True), repeat)
+                row[f"Query_{name}_us"] = query_ms * 1000
+                row[f"Total_{name}_ms"] = build_times[name] + query_ms
+            row["Found"] = len(found)
+            rows.append(row)
+    rows.append({"N": measure_crossover(), "Rect_frac": "crossover"})
+    return pd.DataFrame(rows)
+
+
+def bench_tree_cache(sizes=(10_000, 100_000), repeat=20):
+    """get_points_in_area bez cache vs z TreeCache (pierwsze i kolejne wywołania)."""
+    rect = region_to_rect(QUERY_REGION)
+    rows = []
+    for n in sizes:
+        points = gen_uniform(n)
+        for algorithm in ("quadtree", "kdtree"):
+            cache = TreeCache()
+            uncached_ms, _ = time_ms(lambda: get_points_in_area(algorithm, points, rect, cache=None))
+            cold_ms, _ = time_ms(lambda: get_points_in_area(algorithm, points, rect, cache=cache))
+            warm_ms, found = time_ms(lambda: get_points_in_area(algorithm, points, rect, cache=cache),
+                                     repeat)
+            rows.append({
+                "Algorithm": algorithm,
+                "N": n,
+                "Found": len(found),
+                "Uncached_ms": uncached_ms,
+                "Cold_ms": cold_ms,
+                "Warm_us": warm_ms * 1000,
+                "Hits": cache.hits,
+                "Misses": cache.misses,
+            })
+    return pd.DataFrame(rows)
+
+
+def bench_query(sizes=(20_000, 100_000), repeat=20):
+    """Czasy zapytania KD-Tree i Quadtree (kolumny jak w data_test2/*.csv)."""
+    rect = region_to_rect(QUERY_REGION)
+    rows = []
+    for dataset, gen in DATASETS.items():
+        for n in sizes:
+            points = gen(n)
+            kd = KDTree(points)
+            qt = build_quadtree(points)
+            kd_ms, found = time_ms(lambda: kd.query(QUERY_REGION), repeat)
+            qt_ms, _ = time_ms(lambda: qt.query(rect), repeat)
+            rows.append({
+                "Dataset": dataset,
+                "N": n,
+                "Found": len(found),
+                "Query_KD_us": kd_ms * 1000,
+                "Query_QT_us": qt_ms * 1000,
+            })
+    return pd.DataFrame(rows)
+
+
+BENCHMARKS = {
+    "flat_kdtree": bench_flat_kdtree,
+    "kdtree_build": bench_kdtree_build,
+    "kdtree_leaf_size": bench_kdtree_leaf_size,
+    "count": bench_count,
+    "query_many": bench_query_many,
+    "nearest": bench_nearest,
+    "quadtree_nearest": bench_quadtree_nearest,
+    "radius": bench_radius,
+    "pairs_within": bench_pairs_within,
+    "dynamic_kdtree": bench_dynamic_kdtree,
+    "quadtree_build": bench_quadtree_build,
+    "linear_quadtree": bench_linear_quadtree,
+    "compressed_quadtree": bench_compressed_quadtree,
+    "quadtree_memory": bench_quadtree_memory,
+    "quadtree_move": bench_quadtree_move,
+    "grid_index": bench_grid_index,
+    "range_tree": bench_range_tree,
+    "rtree": bench_rtree,
+    "brute_force": bench_brute_force,
+    "tree_cache": bench_tree_cache,
+    "query": bench_query,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"== {name} ==")
+        print(BENCHMARKS[name]().to_string(index=False))
+        print()
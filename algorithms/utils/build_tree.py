@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from algorithms.quadtree.quadtree import QuadTree, Rectangle, Point, build_quadtree
 from algorithms.quadtree.quadtree_visualization import quadtree_vis
 from algorithms.quadtree.quadtree_query_visualization import visualize_quadtree_query
@@ -6,31 +8,197 @@ from algorithms.kd_tree.kd_class import *
 from algorithms.kd_tree.kd_build_visualization import *
 from algorithms.kd_tree.kd_query_visualization import *
 
+from algorithms.grid.grid_index import GridIndex
+from algorithms.range_tree.range_tree import RangeTree
+from algorithms.rtree.rtree import RTree
+from algorithms.brute_force.brute_force import BruteForceIndex
+
+from algorithms.utils.arrays import as_points_array
+from algorithms.utils.spatial_index import choose_engine
+
+# Przybliżona pamięć drzewa na punkt (tracemalloc, 100k punktów jednostajnych)
+_BYTES_PER_POINT = {"quadtree": 320, "kdtree": 400}
+_FINGERPRINT_SAMPLES = 64
+_MAX_CHOICES = 256
+
+
+def _fingerprint(points_list):
+    """Tani odcisk zawartości: liczność i próbka równo rozłożonych punktów."""
+    n = len(points_list)
+    step = max(1, n // _FINGERPRINT_SAMPLES)
+    positions = list(range(0, n, step))
+    if n:
+        positions.append(n - 1)
+    sample = as_points_array([points_list[i] for i in positions])
+    return n, hash(sample.tobytes())
+
+
+class TreeCache:
+    """Cache LRU zbudowanych drzew, ograniczony szacowaną pamięcią.
+
+    Klucz to (algorytm, k, tożsamość listy, odcisk próbki), więc inna lista
+    o tych samych współrzędnych dostaje własne drzewo (i własne obiekty Point).
+    Wpis trzyma referencję do listy, żeby jej id nie mogło zostać użyte
+    ponownie. Odcisk obejmuje tylko próbkę punktów - po zmianie listy
+    w miejscu trzeba wywołać invalidate(). Wybór silnika dla 'auto' jest
+    zapamiętywany tak samo, żeby planer nie liczył próbki przy każdym zapytaniu.
+    """
+
+    def __init__(self, max_bytes=256 * 2**20):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.choices = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _drop(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.nbytes -= size
+
+    def resolve(self, algorithm, points_list):
+        """Nazwa silnika; 'auto' jest rozstrzygane raz dla danej wersji listy."""
+        if algorithm != "auto":
+            return algorithm
+        key = (id(points_list), _fingerprint(points_list))
+        choice = self.choices.get(key)
+        if choice is not None:
+            self.choices.move_to_end(key)
+            return choice[0]
+
+        for old_key, (_, source) in list(self.choices.items()):
+            if source is points_list:
+                del self.choices[old_key]
+        engine = choose_engine(points_list)
+        # Referencja do listy, jak we wpisach drzew, żeby id nie wróciło z inną listą
+        self.choices[key] = (engine, points_list)
+        if len(self.choices) > _MAX_CHOICES:
+            self.choices.popitem(last=False)
+        return engine
+
+    def get(self, algorithm, points_list, k=4):
+        fingerprint = _fingerprint(points_list)
+        key = (algorithm, k, id(points_list), fingerprint)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        # Drzewa starej wersji tej samej listy nie będą już trafiane
+        for old_key, (_, _, source) in list(self.entries.items()):
+            if source is points_list and old_key[3] != fingerprint:
+                self._drop(old_key)
+
+        tree = build_tree(algorithm, points_list, k)
+        if tree is None:
+            return None
+        size = getattr(tree, "nbytes", None) or _BYTES_PER_POINT.get(algorithm, 0) * len(points_list)
+        if size > self.max_bytes:
+            return tree
+
+        self.entries[key] = (tree, size, points_list)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, old_size, _) = self.entries.popitem(last=False)
+            self.nbytes -= old_size
+            self.evictions += 1
+        return tree
+
+    def invalidate(self, points_list=None):
+        """Usuwa drzewa zbudowane z `points_list` (wszystkie, gdy None)."""
+        if points_list is None:
+            self.entries.clear()
+            self.choices.clear()
+            self.nbytes = 0
+            return
+        for key, (_, _, source) in list(self.entries.items()):
+            if source is points_list:
+                self._drop(key)
+        for key, (_, source) in list(self.choices.items()):
+            if source is points_list:
+                del self.choices[key]
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self.entries), "nbytes": self.nbytes}
+
+
+TREE_CACHE = TreeCache()
+
+
 def build_tree(algorithm, points_list, k=4):
+    if algorithm == 'auto':
+        algorithm = choose_engine(points_list)
+
     if algorithm == 'quadtree':
         return build_quadtree(points_list, capacity=k)
 
     elif algorithm == "kdtree":
         return KDTree(points_list)
+
+    elif algorithm == "grid":
+        return GridIndex(points_list, capacity=k)
+
+    elif algorithm == "brute":
+        return BruteForceIndex(points_list)
+
+    elif algorithm == "range_tree":
+        return RangeTree(points_list)
+
+    elif algorithm == "rtree":
+        return RTree.from_points(points_list, fanout=max(2, k))
     
     return None
 
-def get_points_in_area(algorithm, points_list, search_area, k=4):
-    tree = build_tree(algorithm, points_list, k)
+def get_points_in_area(algorithm, points_list, search_area, k=4, return_indices=False,
+                       cache=TREE_CACHE):
+    if cache is None:
+        if algorithm == 'auto':
+            algorithm = choose_engine(points_list)
+        tree = build_tree(algorithm, points_list, k)
+    else:
+        algorithm = cache.resolve(algorithm, points_list)
+        tree = cache.get(algorithm, points_list, k)
 
     if algorithm == 'quadtree':
+        if return_indices:
+            return tree.query(search_area, return_indices=True)
         found_points = []
         tree.query(search_area, found_points)
         return found_points
 
-    elif algorithm == "kdtree":
+    elif algorithm in ("kdtree", "range_tree"):
         min_x = search_area.x - search_area.w
         max_x = search_area.x + search_area.w
         min_y = search_area.y - search_area.h
         max_y = search_area.y + search_area.h
         
         region = (min_x, max_x, min_y, max_y)
+
+        if return_indices:
+            return tree.query(region, return_indices=True)
         
         found_tuples = tree.query(region)
         
-        return [Point(pt[0], pt[1]) for pt in found_tuples]
\ No newline at end of file
+        return [Point(pt[0], pt[1]) for pt in found_tuples]
+
+    elif algorithm == "rtree":
+        region = (search_area.x - search_area.w, search_area.x + search_area.w,
+                  search_area.y - search_area.h, search_area.y + search_area.h)
+        ids = tree.query(region)
+        if return_indices:
+            return ids
+
+        return [Point(x, y) for x, y in tree.boxes[ids][:, [0, 2]].tolist()]
+
+    elif algorithm in ("grid", "brute"):
+        if return_indices:
+            return tree.query(search_area, return_indices=True)
+
+        return [Point(x, y) for x, y in tree.query(search_area)]
\ No newline at end of file
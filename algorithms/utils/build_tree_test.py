@@ -0,0 +1,156 @@
+import random
+
+from algorithms.quadtree.quadtree import Rectangle, Point
+from algorithms.utils.build_tree import TreeCache, get_points_in_area
+from algorithms.utils.spatial_index import ENGINES
+
+def _points(n, seed):
+    rng = random.Random(seed)
+    return [(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(n)]
+
+def _check_hits_and_misses():
+    cache = TreeCache()
+    points = _points(1000, 0)
+    rect = Rectangle(50, 50, 10, 10)
+    first = get_points_in_area("kdtree", points, rect, cache=cache)
+    second = get_points_in_area("kdtree", points, rect, cache=cache)
+    get_points_in_area("quadtree", points, rect, cache=cache)
+    get_points_in_area("quadtree", points, rect, cache=cache)
+    # Kopia listy to inny klucz, nawet przy tej samej zawartości
+    get_points_in_area("kdtree", list(points), rect, cache=cache)
+    return (cache.hits, cache.misses, len(cache)) == (2, 3, 3) and len(first) == len(second)
+
+def _check_single_point_change():
+    # Zmiana jednego punktu w miejscu + invalidate() musi dać nowe drzewo
+    cache = TreeCache()
+    rect = Rectangle(50, 50, 0.01, 0.01)
+    ok = True
+    for seed, algorithm in enumerate(("kdtree", "quadtree", "grid")):
+        points = _points(10_000, seed)
+        get_points_in_area(algorithm, points, rect, cache=cache)
+        points[1] = (50.0, 50.0)
+        cache.invalidate(points)
+        ok = ok and len(get_points_in_area(algorithm, points, rect, cache=cache)) == 1
+    return ok and cache.hits == 0 and len(cache) == 3
+
+def _check_copy_is_separate():
+    # Kopia różniąca się jednym punktem to inna lista - nie dostaje drzewa oryginału
+    cache = TreeCache()
+    a = _points(10_000, 1)
+    b = list(a)
+    b[1] = (50.0, 50.0)
+    rect = Rectangle(50, 50, 0.01, 0.01)
+    ok = True
+    for algorithm in ("kdtree", "quadtree", "grid"):
+        get_points_in_area(algorithm, a, rect, cache=cache)
+        ok = ok and len(get_points_in_area(algorithm, b, rect, cache=cache)) == 1
+    return ok and cache.hits == 0
+
+def _check_caller_objects():
+    # Te same współrzędne, inne obiekty: wynik to obiekty z listy wywołującego
+    cache = TreeCache()
+    a = [Point(1, 1, "asset-A"), Point(5, 5, "asset-B")]
+    b = [Point(1, 1, "other-X"), Point(5, 5, "other-Y")]
+    rect = Rectangle(1, 1, 0.5, 0.5)
+    get_points_in_area("quadtree", a, rect, cache=cache)
+    r = get_points_in_area("quadtree", b, rect, cache=cache)
+    again = get_points_in_area("quadtree", b, rect, cache=cache)
+    return (len(r) == 1 and r[0] is b[0] and r[0].user_data == "other-X"
+            and again[0] is b[0] and cache.hits == 1)
+
+def _check_in_place_edit():
+    cache = TreeCache()
+    points = _points(1000, 2)
+    rect = Rectangle(50, 50, 0.01, 0.01)
+    get_points_in_area("kdtree", points, rect, cache=cache)
+    points[500] = (50.0, 50.0)
+    cache.invalidate(points)
+    found = get_points_in_area("kdtree", points, rect, cache=cache)
+    return len(found) == 1 and cache.misses == 2 and len(cache) == 1
+
+def _check_point_objects_moved():
+    cache = TreeCache()
+    points = [Point(x, y) for x, y in _points(500, 3)]
+    rect = Rectangle(50, 50, 0.01, 0.01)
+    get_points_in_area("quadtree", points, rect, cache=cache)
+    points[0].x, points[0].y = 50.0, 50.0
+    cache.invalidate(points)
+    return len(get_points_in_area("quadtree", points, rect, cache=cache)) == 1 and cache.hits == 0
+
+def _check_resized_list():
+    # Zmiana liczności zmienia odcisk, a drzewo starej wersji jest usuwane
+    cache = TreeCache()
+    points = _points(1000, 4)
+    rect = Rectangle(50, 50, 0.01, 0.01)
+    get_points_in_area("kdtree", points, rect, cache=cache)
+    points.append((50.0, 50.0))
+    found = get_points_in_area("kdtree", points, rect, cache=cache)
+    return len(found) == 1 and cache.misses == 2 and len(cache) == 1
+
+def _check_lru_eviction():
+    datasets = [_points(1000, 10 + i) for i in range(3)]
+    # Miejsce na dwa drzewa KD (szacunek 400 B na punkt)
+    cache = TreeCache(max_bytes=2 * 400 * 1000)
+    rect = Rectangle(50, 50, 10, 10)
+    get_points_in_area("kdtree", datasets[0], rect, cache=cache)
+    get_points_in_area("kdtree", datasets[1], rect, cache=cache)
+    get_points_in_area("kdtree", datasets[0], rect, cache=cache)   # 0 staje się najświeższe
+    get_points_in_area("kdtree", datasets[2], rect, cache=cache)   # wypiera 1
+    hits_before = cache.hits
+    get_points_in_area("kdtree", datasets[0], rect, cache=cache)
+    kept = cache.hits == hits_before + 1
+    get_points_in_area("kdtree", datasets[1], rect, cache=cache)
+    return (kept and cache.evictions >= 1 and cache.nbytes <= cache.max_bytes
+            and cache.misses == 4)
+
+def _check_oversized_tree_not_cached():
+    cache = TreeCache(max_bytes=1000)
+    get_points_in_area("kdtree", _points(1000, 4), Rectangle(50, 50, 10, 10), cache=cache)
+    return len(cache) == 0 and cache.nbytes == 0
+
+def _check_invalidate():
+    cache = TreeCache()
+    a, b = _points(500, 5), _points(500, 6)
+    rect = Rectangle(50, 50, 10, 10)
+    for algorithm in ("kdtree", "quadtree"):
+        get_points_in_area(algorithm, a, rect, cache=cache)
+    get_points_in_area("kdtree", b, rect, cache=cache)
+    cache.invalidate(a)
+    only_b = len(cache) == 1
+    get_points_in_area("kdtree", b, rect, cache=cache)
+    cache.invalidate()
+    return only_b and cache.hits == 1 and len(cache) == 0 and cache.nbytes == 0
+
+def _check_auto_resolved_once():
+    cache = TreeCache()
+    points = _points(5000, 7)
+    rect = Rectangle(50, 50, 10, 10)
+    expected = sorted((p.x, p.y) for p in get_points_in_area("brute", points, rect, cache=None))
+    results = [sorted((p.x, p.y) for p in get_points_in_area("auto", points, rect, cache=cache))
+               for _ in range(3)]
+    engine = cache.resolve("auto", points)
+    resolved_once = len(cache.choices) == 1 and cache.hits == 2 and cache.misses == 1
+    cache.invalidate(points)
+    return (resolved_once and all(r == expected for r in results) and engine in ENGINES
+            and not cache.choices and len(cache) == 0)
+
+def run_tree_cache_tests():
+    print("rozpoczynam test TreeCache")
+    checks = [_check_hits_and_misses, _check_single_point_change, _check_copy_is_separate,
+              _check_caller_objects, _check_in_place_edit, _check_point_objects_moved,
+              _check_resized_list, _check_lru_eviction, _check_oversized_tree_not_cached,
+              _check_invalidate, _check_auto_resolved_once]
+    passed = 0
+    total = len(checks)
+
+    for i, check in enumerate(checks):
+        if check():
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD! ({check.__name__})")
+
+    print(f"\nWynik TreeCache: {passed}/{total} zaliczonych.\n")
+
+if __name__ == "__main__":
+    run_tree_cache_tests()
@@ -1,14 +1,12 @@
 import random
 import pprint
 
+from algorithms.brute_force.brute_force import BruteForceIndex
+from algorithms.quadtree.quadtree import Rectangle
+
 def solve_brute_force(points, rect_tuple):
-    cx, cy, w, h = rect_tuple
-    found = []
-    for p in points:
-        px, py = p
-        if (cx - w <= px <= cx + w) and (cy - h <= py <= cy + h):
-            found.append(p)
-    return sorted(found)
+    ids = BruteForceIndex(points).query(Rectangle(*rect_tuple), return_indices=True)
+    return sorted(points[i] for i in ids.tolist())
 
 def generate_test_file():
     tests = []
@@ -0,0 +1,337 @@
+import time
+from abc import ABC, abstractmethod
+from itertools import islice
+
+import numpy as np
+
+from algorithms.kd_tree.kd_class import KDTree
+from algorithms.grid.grid_index import GridIndex
+from algorithms.range_tree.range_tree import RangeTree
+from algorithms.rtree.rtree import RTree
+from algorithms.brute_force.brute_force import BruteForceIndex
+from algorithms.quadtree.quadtree import Rectangle, build_quadtree
+from algorithms.utils.arrays import as_points_array
+
+
+def rect_to_region(rect):
+    """Rectangle(cx, cy, w, h) -> (x_min, x_max, y_min, y_max)."""
+    return (rect.x - rect.w, rect.x + rect.w, rect.y - rect.h, rect.y + rect.h)
+
+
+class SpatialIndex(ABC):
+    """Wspólny interfejs silników: obszar zapytania to zawsze Rectangle.
+
+    query zwraca listę krotek (x, y) albo tablicę indeksów punktów wejściowych,
+    iter_query - leniwy iterator krotek.
+    """
+
+    name = None
+
+    @classmethod
+    @abstractmethod
+    def build(cls, points_list, capacity=4):
+        ...
+
+    @abstractmethod
+    def __len__(self):
+        ...
+
+    @abstractmethod
+    def query(self, rect, return_indices=False):
+        ...
+
+    def count(self, rect):
+        return len(self.query(rect, return_indices=True))
+
+    def iter_query(self, rect, limit=None):
+        return islice(iter(self.query(rect)), limit)
+
+    def any_in(self, rect):
+        for _ in self.iter_query(rect, 1):
+            return True
+        return False
+
+
+class KDTreeIndex(SpatialIndex):
+    name = "kdtree"
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    @classmethod
+    def build(cls, points_list, capacity=4):
+        return cls(KDTree(points_list))
+
+    def __len__(self):
+        return len(self.tree.index)
+
+    def query(self, rect, return_indices=False):
+        return self.tree.query(rect_to_region(rect), return_indices=return_indices)
+
+    def count(self, rect):
+        return self.tree.count(rect_to_region(rect))
+
+    def iter_query(self, rect, limit=None):
+        return self.tree.iter_query(rect_to_region(rect), limit)
+
+    def any_in(self, rect):
+        return self.tree.any_in(rect_to_region(rect))
+
+
+class QuadTreeIndex(SpatialIndex):
+    name = "quadtree"
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    @classmethod
+    def build(cls, points_list, capacity=4):
+        return cls(build_quadtree(points_list, capacity=capacity))
+
+    def __len__(self):
+        return self.tree.size
+
+    def query(self, rect, return_indices=False):
+        if return_indices:
+            return self.tree.query(rect, return_indices=True)
+        return [(p.x, p.y) for p in self.tree.query(rect)]
+
+    def count(self, rect):
+        return self.tree.count(rect)
+
+    def iter_query(self, rect, limit=None):
+        return ((p.x, p.y) for p in self.tree.iter_query(rect, limit))
+
+    def any_in(self, rect):
+        return self.tree.any_in(rect)
+
+
+class GridEngine(SpatialIndex):
+    name = "grid"
+
+    def __init__(self, grid):
+        self.tree = grid
+
+    @classmethod
+    def build(cls, points_list, capacity=4):
+        return cls(GridIndex(points_list, capacity=capacity))
+
+    def __len__(self):
+        return len(self.tree)
+
+    def query(self, rect, return_indices=False):
+        return self.tree.query(rect, return_indices=return_indices)
+
+    def count(self, rect):
+        return self.tree.count(rect)
+
+    def iter_query(self, rect, limit=None):
+        return self.tree.iter_query(rect, limit)
+
+    def any_in(self, rect):
+        return self.tree.any_in(rect)
+
+
+class RangeTreeIndex(SpatialIndex):
+    name = "range_tree"
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    @classmethod
+    def build(cls, points_list, capacity=4):
+        return cls(RangeTree(points_list))
+
+    def __len__(self):
+        return self.tree.n
+
+    def query(self, rect, return_indices=False):
+        return self.tree.query(rect_to_region(rect), return_indices=return_indices)
+
+    def count(self, rect):
+        return self.tree.count(rect_to_region(rect))
+
+    def iter_query(self, rect, limit=None):
+        return self.tree.iter_query(rect_to_region(rect), limit)
+
+    def any_in(self, rect):
+        return self.tree.any_in(rect_to_region(rect))
+
+
+class RTreeIndex(SpatialIndex):
+    name = "rtree"
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    @classmethod
+    def build(cls, points_list, capacity=4):
+        return cls(RTree.from_points(points_list))
+
+    def __len__(self):
+        return len(self.tree)
+
+    def query(self, rect, return_indices=False):
+        ids = self.tree.query(rect_to_region(rect))
+        if return_indices:
+            return ids
+        boxes = self.tree.boxes[ids]
+        return list(zip(boxes[:, 0].tolist(), boxes[:, 2].tolist()))
+
+    def count(self, rect):
+        return self.tree.count(rect_to_region(rect))
+
+    def iter_query(self, rect, limit=None):
+        boxes = self.tree.boxes
+        return ((float(boxes[i, 0]), float(boxes[i, 2]))
+                for i in self.tree.iter_query(rect_to_region(rect), limit=limit))
+
+    def any_in(self, rect):
+        return self.tree.any_in(rect_to_region(rect))
+
+
+class BruteForceEngine(SpatialIndex):
+    name = "brute"
+
+    def __init__(self, index):
+        self.tree = index
+
+    @classmethod
+    def build(cls, points_list, capacity=4):
+        return cls(BruteForceIndex(points_list))
+
+    def __len__(self):
+        return len(self.tree)
+
+    def query(self, rect, return_indices=False):
+        return self.tree.query(rect, return_indices=return_indices)
+
+    def count(self, rect):
+        return self.tree.count(rect)
+
+    def iter_query(self, rect, limit=None):
+        return self.tree.iter_query(rect, limit)
+
+    def any_in(self, rect):
+        return self.tree.any_in(rect)
+
+
+ENGINES = {
+    "kdtree": KDTreeIndex,
+    "quadtree": QuadTreeIndex,
+    "grid": GridEngine,
+    "range_tree": RangeTreeIndex,
+    "rtree": RTreeIndex,
+    "brute": BruteForceEngine,
+}
+
+_SAMPLE_SIZE = 2048
+
+
+def sample_stats(points_list, sample_size=_SAMPLE_SIZE, seed=0):
+    """Tanie statystyki próbki punktów dla planera.
+
+    spread     - stosunek wartości własnych kowariancji (0 = punkty współliniowe),
+    duplicates - udział powtórzonych punktów w próbce,
+    empty      - udział pustych komórek siatki o ~2 punktach na komórkę
+                 (ok. 0.13 dla rozkładu jednostajnego, więcej dla skupisk).
+    """
+    n = len(points_list)
+    rng = np.random.default_rng(seed)
+    picks = rng.choice(n, min(n, sample_size), replace=False) if n else []
+    sample = as_points_array([points_list[i] for i in picks])
+    m = len(sample)
+    stats = {"n": n, "spread": 1.0, "duplicates": 0.0, "empty": 0.0}
+    if m < 3:
+        return stats
+
+    eig = np.linalg.eigvalsh(np.cov(sample.T))
+    stats["spread"] = float(eig[0] / eig[1]) if eig[1] > 0 else 0.0
+    stats["duplicates"] = 1 - len(np.unique(sample, axis=0)) / m
+
+    g = max(1, int(np.sqrt(m / 2)))
+    lo = sample.min(axis=0)
+    span = np.maximum(sample.max(axis=0) - lo, 1e-12)
+    cell = np.minimum(((sample - lo) / span * g).astype(np.int64), g - 1)
+    occupied = len(np.unique(cell[:, 0] * g + cell[:, 1]))
+    stats["empty"] = 1 - occupied / (g * g)
+    return stats
+
+
+_crossover = None
+
+
+def _best_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - t0) * 1000)
+    return best
+
+
+def measure_crossover(max_n=1 << 20, repeat=20, seed=0):
+    """Najmniejsze n, przy którym zapytanie do indeksu jest szybsze niż maska brute force.
+
+    Pomiar na danych jednostajnych i prostokącie o boku 5% rozpiętości.
+    Indeks jest traktowany jak już zbudowany (TreeCache), a porównaniem jest
+    GridIndex - silnik o najtańszym zapytaniu na takich danych.
+    """
+    rng = np.random.default_rng(seed)
+    rect = Rectangle(0, 0, 5, 5)
+    n = 1 << 10
+    while n < max_n:
+        points = rng.uniform(-100, 100, size=(n, 2))
+        brute = BruteForceIndex(points)
+        grid = GridIndex(points)
+        brute_ms = _best_ms(lambda: brute.query(rect, return_indices=True), repeat)
+        grid_ms = _best_ms(lambda: grid.query(rect, return_indices=True), repeat)
+        if grid_ms < brute_ms:
+            return n
+        n *= 2
+    return max_n
+
+
+def brute_force_crossover():
+    """Próg brute force dla tej maszyny, mierzony przy pierwszym użyciu."""
+    global _crossover
+    if _crossover is None:
+        _crossover = measure_crossover()
+    return _crossover
+
+
+def choose_engine(points_list, stats=None, crossover=None):
+    """Wybór silnika na podstawie statystyk próbki.
+
+    Progi z data_test2/full_summary.csv (stosunek Query_QT_us / Query_KD_us):
+    Quadtree wygrywa na prostej (Line_YX) do 100k punktów oraz na danych
+    rozłożonych równomiernie do ~10k, KD-Tree na skupiskach (Gauss, Ring)
+    już od kilku tysięcy punktów i na wszystkim powyżej ~20k. Dane prawie
+    równomierne (Uniform, Grid) obsługuje GridIndex (benchmark grid_index).
+    Poniżej progu `crossover` (domyślnie brute_force_crossover()) wygrywa
+    sama maska NumPy.
+    """
+    if crossover is None:
+        crossover = brute_force_crossover()
+    if len(points_list) < crossover:
+        return "brute"
+
+    if stats is None:
+        stats = sample_stats(points_list)
+    n = stats["n"]
+
+    if stats["duplicates"] > 0.1:
+        # Duplikaty budują w Quadtree łańcuchy do max_depth
+        return "kdtree"
+    if stats["spread"] < 0.01:
+        return "quadtree"
+    if stats["empty"] > 0.3:
+        return "quadtree" if n <= 1_000 else "kdtree"
+    return "grid"
+
+
+def build_index(algorithm, points_list, k=4):
+    """Buduje silnik o nazwie `algorithm` (lub wybrany przez planer dla 'auto')."""
+    if algorithm == "auto":
+        algorithm = choose_engine(points_list)
+    return ENGINES[algorithm].build(points_list, capacity=k)
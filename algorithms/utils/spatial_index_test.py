@@ -0,0 +1,63 @@
+from algorithms.quadtree.quadtree import Rectangle
+from algorithms.utils.spatial_index import ENGINES, build_index, choose_engine, sample_stats
+from algorithms.utils.benchmarks import DATASETS
+from test_data import TEST_DATA
+
+def run_spatial_index_tests():
+    print("rozpoczynam test wspólnego interfejsu silników")
+    passed = 0
+    total = len(TEST_DATA)
+
+    for i, case in enumerate(TEST_DATA):
+        points = case["P"]
+        expected = case["RES"]
+        q_rect = Rectangle(*case["R"])
+
+        ok = True
+        for name in list(ENGINES) + ["auto"]:
+            index = build_index(name, points)
+            result = sorted(index.query(q_rect))
+            by_index = sorted(points[j] for j in index.query(q_rect, return_indices=True))
+            lazy = sorted(index.iter_query(q_rect))
+            ok = (ok and result == expected and by_index == expected and lazy == expected
+                  and index.count(q_rect) == len(expected) and len(index) == len(points)
+                  and index.any_in(q_rect) == bool(expected)
+                  and len(list(index.iter_query(q_rect, 1))) == min(1, len(expected)))
+
+        if ok:
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+
+    print(f"\nWynik interfejsu silników: {passed}/{total} zaliczonych.\n")
+
+def run_planner_tests(n=20_000):
+    print(f"rozpoczynam test planera (n={n})")
+    expected = {"Uniform": "grid", "Gauss": "kdtree", "Line_YX": "quadtree",
+                "Envelope": "kdtree", "Grid": "grid", "Ring": "kdtree"}
+    passed = 0
+    total = len(expected)
+
+    for i, (dataset, engine) in enumerate(expected.items()):
+        points = DATASETS[dataset](n)
+        chosen = choose_engine(points, sample_stats(points), crossover=0)
+        if chosen == engine:
+            print(f"Test {i+1}/{total}: ZALICZONY")
+            passed += 1
+        else:
+            print(f"Test {i+1}/{total}: BŁĄD!")
+            print(f"   {dataset}: oczekiwano {engine}, wybrano {chosen}")
+
+    small = DATASETS["Gauss"](100)
+    total += 1
+    if choose_engine(small, crossover=1_000) == "brute" and choose_engine(points, crossover=1_000) != "brute":
+        passed += 1
+    else:
+        print(f"Test {total}/{total}: BŁĄD! (próg brute force)")
+
+    print(f"\nWynik planera: {passed}/{total} zaliczonych.\n")
+
+if __name__ == "__main__":
+    run_spatial_index_tests()
+    run_planner_tests()